@@ -0,0 +1,87 @@
+# Third-party imports
+import numpy as np
+
+# How far ahead the solver follows targets, in seconds of game time; a
+# bullet leaves the playfield within about 17 ticks at 60 ticks per second
+AIM_HORIZON = 0.5
+
+
+def ball_paths(pos, steps: int, fall: float, sway: float):
+    """
+    Lower-left corners of balls over the next ticks, moved like World.update_enemies()
+    Args:
+        pos: (n, 2) array of current ball corners
+        steps: Ticks to predict
+        fall: World.ball_speed, pixels dropped per tick
+        sway: World.ball_sway, scale of the sideways drift per tick
+    Returns:
+        (x, y) arrays of shape (n, steps); column i is the corner after i + 1 ticks
+    """
+    y_before = pos[:, 1:2] - np.arange(steps) * fall  # Height at the start of each tick
+    x = pos[:, 0:1] + np.cumsum(np.sin(y_before / 50) * sway, axis=1)
+    return x, y_before - fall
+
+
+def solve_intercepts(origin, speed: float, gravity: float, target_x, target_y, target_size,
+                     projectile_size, bounds, time_scale: float = 1.0):
+    """
+    Headings that send a projectile under gravity into each moving target
+    Args:
+        origin: (x, y) lower-left corner of the projectile at launch
+        speed: Launch speed per tuned tick
+        gravity: Speed lost per tuned tick
+        target_x, target_y: (n, steps) predicted target corners, e.g. from ball_paths()
+        target_size: (width, height) of the targets
+        projectile_size: (width, height) of the projectile
+        bounds: (width, height) of the playfield; the projectile is gone once outside
+        time_scale: World.time_scale
+    Returns:
+        (headings, hit_steps): launch heading in degrees per target, and the tick
+        of the hit counting from one; NaN and 0 where no heading hits the target
+    """
+    n, steps = target_x.shape
+    if not n or not steps:
+        return np.full(n, np.nan), np.zeros(n, np.int64)
+
+    k = time_scale
+    half_w, half_h = projectile_size[0] / 2, projectile_size[1] / 2
+    ox, oy = origin[0] + half_w, origin[1] + half_h
+    tick = np.arange(1, steps + 1)
+    drop = gravity * k * k * tick * (tick - 1) / 2  # Height lost to gravity after each tick
+
+    # Straight-line velocity that meets each target's center at each tick, once
+    # the gravity drop is added back; the earliest tick it is fast enough to
+    # reach is the intercept
+    dx = target_x + target_size[0] / 2 - ox
+    dy = target_y + target_size[1] / 2 - oy + drop
+    needed = np.hypot(dx, dy) / (tick * k)
+    angles = np.arctan2(dy, dx)
+    reachable = needed <= speed
+    found = reachable.any(axis=1)
+    first = np.argmax(reachable, axis=1)
+
+    # The speed needed falls between two ticks; blend their headings to match it
+    rows = np.arange(n)
+    previous = np.maximum(first - 1, 0)
+    slow, fast = needed[rows, previous], needed[rows, first]
+    with np.errstate(divide='ignore', invalid='ignore'):
+        blend = np.where(first > 0, (slow - speed) / (slow - fast), 0.0)
+    turn = angles[rows, first] - angles[rows, previous]
+    turn = (turn + np.pi) % (2 * np.pi) - np.pi  # Shortest way round
+    headings = angles[rows, previous] + np.clip(blend, 0, 1) * turn
+
+    # Fly each candidate heading through the same ticks and keep the ones that hit
+    candidates = np.flatnonzero(found)
+    target_x, target_y = target_x[candidates], target_y[candidates]
+    px = ox + np.cos(headings[candidates])[:, None] * (speed * k * tick) - half_w
+    py = oy + np.sin(headings[candidates])[:, None] * (speed * k * tick) - (drop + half_h)
+    inside = np.logical_and.accumulate((px >= 0) & (px <= bounds[0]) & (py >= 0) & (py <= bounds[1]), axis=1)
+    hits = (inside &
+            (px < target_x + target_size[0]) & (px + projectile_size[0] > target_x) &
+            (py < target_y + target_size[1]) & (py + projectile_size[1] > target_y))
+    hit = hits.any(axis=1)
+    result = np.full(n, np.nan)
+    result[candidates[hit]] = np.degrees(headings[candidates[hit]])
+    hit_steps = np.zeros(n, np.int64)
+    hit_steps[candidates[hit]] = np.argmax(hits[hit], axis=1) + 1
+    return result, hit_steps
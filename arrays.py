@@ -0,0 +1,77 @@
+# Third-party imports
+import numpy as np
+
+
+class ParallelArrays:
+    """Rows of one kind stored as parallel NumPy arrays, in insertion order
+
+    Subclasses list their arrays in COLUMNS as (attribute, shape of one
+    row, dtype). Live rows occupy the first `count` slots of every array,
+    so callers work on whole slices in one vectorized step. When the rows
+    run out every array doubles, and `allocations` counts the rows added
+    beyond the up-front capacity. Removal keeps the remaining rows in
+    order.
+    """
+    COLUMNS = ()
+
+    def __init__(self, capacity: int):
+        """
+        Initialize the arrays
+        Args:
+            capacity: Rows allocated up front; more are added when it runs out
+        """
+        self.capacity = capacity
+        self.count = 0
+        self.high_water = 0
+        self.allocations = 0
+        for name, shape, dtype in self.COLUMNS:
+            setattr(self, name, np.zeros((capacity, *shape), dtype))
+
+    def __len__(self) -> int:
+        return self.count
+
+    def arrays(self) -> tuple:
+        return tuple(getattr(self, name) for name, _, _ in self.COLUMNS)
+
+    def grow(self, capacity: int):
+        extra = capacity - len(getattr(self, self.COLUMNS[0][0]))
+        self.allocations += extra
+        for name, shape, dtype in self.COLUMNS:
+            setattr(self, name, np.concatenate([getattr(self, name), np.zeros((extra, *shape), dtype)]))
+
+    def append(self, *values) -> int:
+        """Add a row with one value per column, in COLUMNS order, and return its index"""
+        index = self.count
+        if index == len(getattr(self, self.COLUMNS[0][0])):
+            self.grow(2 * index or 1)
+        for array, value in zip(self.arrays(), values):
+            array[index] = value
+        self.count = index + 1
+        self.high_water = max(self.high_water, self.count)
+        return index
+
+    def remove(self, index: int):
+        n = self.count
+        for array in self.arrays():
+            array[index:n - 1] = array[index + 1:n]
+        self.count = n - 1
+
+    def keep(self, alive):
+        """Drop every row whose entry in the boolean mask `alive` is False"""
+        n = int(np.count_nonzero(alive))
+        if n == self.count:
+            return
+        for array in self.arrays():
+            array[:n] = array[:self.count][alive]
+        self.count = n
+
+    def clear(self):
+        self.count = 0
+
+    def stats(self) -> dict:
+        return {
+            'capacity': self.capacity,
+            'in_use': self.count,
+            'high_water': self.high_water,
+            'allocations': self.allocations
+        }
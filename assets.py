@@ -0,0 +1,191 @@
+# Standard library imports
+import os
+import threading
+import time
+from collections import deque
+
+# Decoded voices by file path, shared by every SoundBank in the process so a
+# restarted game does not decode them again
+_cache = {}
+_cache_lock = threading.Lock()
+
+
+class VoicePool:
+    """Separately decoded copies of one sound, so overlapping triggers can all be heard
+
+    A Kivy Sound restarts when played again, so one object can only voice
+    one trigger at a time. start() uses the first idle voice, checking from
+    just after the last one used; with every voice busy the trigger is
+    dropped, which caps the mixer work per effect.
+    """
+    def __init__(self, voices: list):
+        self.voices = voices
+        self.next = 0
+
+    def start(self) -> bool:
+        count = len(self.voices)
+        for offset in range(count):
+            index = (self.next + offset) % count
+            voice = self.voices[index]
+            if voice.state != 'play':
+                voice.play()
+                self.next = (index + 1) % count
+                return True
+        return False
+
+
+class SoundBank:
+    """Sounds decoded one voice per frame on the caller's thread, in priority order
+
+    start() returns at once. A worker thread reads each file once, which
+    only warms the OS file cache, and queues it; decodes then run through
+    `dispatch` on the caller's thread, where the audio backend expects
+    sounds to be created, one voice per call with each scheduling the next.
+    With Clock.schedule_once as `dispatch`, no frame decodes more than one.
+    Sounds that are still loading are skipped when played, missing files
+    are skipped without an attempt, and every decoded sound is cached for
+    later banks.
+
+    Each effect gets a pool of voices up to its polyphony limit. play()
+    only marks an effect as triggered; flush(), once per frame, starts one
+    voice per triggered effect, so a missile popping a whole wave, or the
+    same sound raised on several ticks of one frame, costs a single pop.
+    """
+    def __init__(self, sound_files: dict, loader, priority=(), polyphony=None, dispatch=None,
+                 on_load=None):
+        """
+        Initialize a sound bank
+        Args:
+            sound_files: Sound name -> file path
+            loader: Callable decoding a path into a sound, e.g. SoundLoader.load; called
+                only through `dispatch`, once per call
+            priority: Names to load first, in order; the rest follow in dict order
+            polyphony: Sound name -> voices that may play at once; default 1
+            dispatch: Callable(callback, *args) running decodes and results on the
+                caller's thread; None runs them directly on the worker thread
+            on_load: Callable(name, sound) run when a sound becomes playable
+        """
+        self.sound_files = sound_files
+        self.loader = loader
+        self.order = [name for name in priority if name in sound_files]
+        self.order += [name for name in sound_files if name not in self.order]
+        self.polyphony = polyphony or {}
+        self.dispatch = dispatch or (lambda callback, *args: callback(*args))
+        self.on_load = on_load
+        self.sounds = {}  # First voice of each playable sound, filled in as they load
+        self.voices = {}  # name -> VoicePool
+        self.triggered = {}  # name -> triggers since the last flush()
+        self.merged = 0
+        self.dropped = 0
+        self.load_times = {}  # name -> seconds spent decoding; 0.0 when cached
+        self.missing = []
+        self.failed = []
+        self.skipped_plays = 0
+        self.pending = deque()  # (name, path, voices, count) read and waiting to be decoded
+        self.pending_lock = threading.Lock()
+        self.decoding = False  # Whether a _decode_next() call is scheduled
+        self.thread = None
+
+    def start(self):
+        self.thread = threading.Thread(target=self._read_all, name='sound-loader', daemon=True)
+        self.thread.start()
+
+    def _read_all(self):
+        for name in self.order:
+            path = self.sound_files[name]
+            count = self.polyphony.get(name, 1)
+            with _cache_lock:
+                voices = list(_cache.get(path, ()))
+            if len(voices) >= count:
+                self.load_times[name] = 0.0
+                self.dispatch(self._loaded, name, voices[:count])
+                continue
+            if not os.path.exists(path):
+                self.missing.append(name)
+                continue
+
+            # The loader reopens the file by path, so this read only warms the
+            # OS cache; it keeps a cold disk from stalling the decode's frame
+            try:
+                with open(path, 'rb') as f:
+                    f.read()
+            except OSError as e:
+                print(f"Could not load {path}: {e}")
+                self.failed.append(name)
+                continue
+            with self.pending_lock:
+                self.pending.append((name, path, voices, count))
+                start = not self.decoding
+                self.decoding = True
+            if start:
+                self.dispatch(self._decode_next)
+
+    def _decode_next(self):
+        """Decode one voice of the first pending sound and schedule the next decode"""
+        with self.pending_lock:
+            if not self.pending:
+                self.decoding = False
+                return
+            name, path, voices, count = self.pending[0]
+
+        start = time.perf_counter()
+        sound = None
+        try:
+            sound = self.loader(path)
+        except Exception as e:
+            print(f"Could not load {path}: {e}")
+        self.load_times[name] = self.load_times.get(name, 0.0) + time.perf_counter() - start
+        if sound is not None:
+            voices.append(sound)
+
+        # Every voice is its own decode; the sound plays once all of them are in
+        if sound is None or len(voices) >= count:
+            with self.pending_lock:
+                self.pending.popleft()
+            if not voices:
+                self.failed.append(name)
+            else:
+                with _cache_lock:
+                    if len(voices) > len(_cache.get(path, ())):
+                        _cache[path] = voices
+                self._loaded(name, voices[:count])
+        self.dispatch(self._decode_next)
+
+    def _loaded(self, name, voices):
+        self.sounds[name] = voices[0]
+        self.voices[name] = VoicePool(voices)
+        if self.on_load is not None:
+            self.on_load(name, voices[0])
+
+    def play(self, name: str):
+        """Trigger a sound; it starts at the next flush()"""
+        if name not in self.voices:
+            self.skipped_plays += 1  # Still loading or unavailable; a late effect is worse than none
+            return
+        self.triggered[name] = self.triggered.get(name, 0) + 1
+
+    def flush(self):
+        """Start one voice for each sound triggered since the last flush"""
+        if not self.triggered:
+            return
+        for name, count in self.triggered.items():
+            self.merged += count - 1
+            if not self.voices[name].start():
+                self.dropped += 1
+        self.triggered.clear()
+
+    @property
+    def loading(self) -> bool:
+        return self.thread is not None and (self.thread.is_alive() or self.decoding)
+
+    def stats(self) -> dict:
+        return {
+            'loaded': len(self.sounds),
+            'total': len(self.sound_files),
+            'load_ms': {name: round(seconds * 1000, 1) for name, seconds in self.load_times.items()},
+            'missing': list(self.missing),
+            'failed': list(self.failed),
+            'skipped_plays': self.skipped_plays,
+            'merged': self.merged,
+            'dropped': self.dropped
+        }
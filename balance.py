@@ -0,0 +1,236 @@
+# Standard library imports
+import argparse
+import csv
+import itertools
+import json
+import os
+import random
+import sys
+import time
+from concurrent.futures import ProcessPoolExecutor
+
+# Game imports
+from benchmark import git_commit, percentile
+from simulation import AIM, FIRE, SWITCH, TICK_RATE, WINDOW_HEIGHT, WINDOW_WIDTH, DifficultyParams, World
+
+# Games longer than this are stopped and counted as survived
+MAX_GAME_SECONDS = 600
+
+# Metrics summarized per configuration
+METRICS = ('survival_seconds', 'level', 'score')
+
+
+class RandomPolicy:
+    """Aims at random points and fires whenever it can, like a button-masher"""
+    def __init__(self, rng: random.Random):
+        self.rng = rng
+
+    def __call__(self, world: World) -> list:
+        rng = self.rng
+        inputs = []
+        if rng.random() < 0.2:
+            inputs.append((AIM, (rng.randrange(world.width), rng.randrange(world.height))))
+        if rng.random() < 0.01:
+            inputs.append((SWITCH, None))
+        if rng.random() < 0.3:
+            inputs.append((FIRE, None))
+        return inputs
+
+
+class ScriptedPolicy:
+    """Shoots the lowest ball and saves missiles for balls about to get through
+
+    Aims a little ahead of the falling ball, fires bullets as soon as they
+    reload and switches to a missile only when a ball is within
+    `danger_height` pixels of the bottom.
+    """
+    def __init__(self, rng: random.Random, danger_height: float = 120):
+        """
+        Initialize a scripted policy
+        Args:
+            rng: Random generator for the aim jitter
+            danger_height: Ball height that calls for a missile
+        """
+        self.rng = rng
+        self.danger_height = danger_height
+
+    def __call__(self, world: World) -> list:
+        balls = world.balls
+        if not balls.count:
+            return [(SWITCH, None)] if world.missile_state == 'ready' else []
+        index = int(balls.pos[:balls.count, 1].argmin())
+        x, y = balls.position(index)
+        danger = y < self.danger_height
+
+        if world.missile_state == 'ready':
+            return [(FIRE, None)] if danger else [(SWITCH, None)]
+        if world.bullet_state != 'ready':
+            return []
+        if danger and world.missile_number > 0:
+            return [(SWITCH, None), (FIRE, None)]
+        lead = world.ball_speed * 10  # Roughly the bullet's flight time in ticks
+        jitter = self.rng.uniform(-5, 5)
+        return [(AIM, (round(x + 20 + jitter), round(y + 20 - lead))), (FIRE, None)]
+
+
+POLICIES = {
+    'random': RandomPolicy,
+    'scripted': ScriptedPolicy
+}
+
+
+def play_game(params: dict, policy: str, seed: int, tick_rate: int, max_seconds: float) -> dict:
+    """
+    Play one headless game to the end or the time limit; runs in a worker process
+    Args:
+        params: DifficultyParams.to_dict() of the curve to play
+        policy: Key in POLICIES
+        seed: Seed for the world and the policy
+        tick_rate: Simulation steps per second
+        max_seconds: Game time after which the game counts as survived
+    Returns:
+        Survival time, level reached and score
+    """
+    world = World(WINDOW_WIDTH, WINDOW_HEIGHT, seed=seed, tick_rate=tick_rate,
+                  difficulty=DifficultyParams(**params))
+    player = POLICIES[policy](random.Random(seed))
+    max_ticks = int(max_seconds * tick_rate)
+    while not world.game_over and world.tick < max_ticks:
+        world.step(player(world))
+        world.events.clear()  # Nothing renders them
+    return {
+        'seed': seed,
+        'survival_seconds': world.time,
+        'level': world.level,
+        'score': world.score,
+        'survived': not world.game_over
+    }
+
+
+def parse_sweep(specs: list) -> list:
+    """
+    Every combination of the swept values as DifficultyParams
+    Args:
+        specs: Strings like 'speed_increment=0.01,0.02,0.03'
+    Returns:
+        One DifficultyParams per combination, the defaults if nothing is swept
+    """
+    defaults = DifficultyParams()
+    axes = []
+    for spec in specs:
+        name, _, values = spec.partition('=')
+        if name not in DifficultyParams.FIELDS or not values:
+            raise ValueError(f"bad sweep '{spec}'; expected one of {', '.join(DifficultyParams.FIELDS)}=v1,v2,...")
+        kind = type(getattr(defaults, name))
+        axes.append([(name, kind(value)) for value in values.split(',')])
+    return [defaults.replace(**dict(combination)) for combination in itertools.product(*axes)]
+
+
+def summarize(games: list) -> dict:
+    """Mean and percentiles of each metric over a configuration's games"""
+    summary = {'games': len(games), 'survived': sum(game['survived'] for game in games)}
+    for metric in METRICS:
+        values = [game[metric] for game in games]
+        summary[metric] = {
+            'mean': sum(values) / len(values),
+            'p10': percentile(values, 0.1),
+            'p50': percentile(values, 0.5),
+            'p90': percentile(values, 0.9),
+            'max': max(values)
+        }
+    return summary
+
+
+def run_sweep(configs: list, games: int, policy: str, seed: int, tick_rate: int, max_seconds: float,
+              workers: int = None) -> list:
+    """
+    Play `games` games of every configuration across a process pool
+    Args:
+        configs: DifficultyParams to compare
+        games: Games per configuration; game i of every configuration uses seed + i
+        policy: Key in POLICIES
+        seed: First game seed
+        tick_rate: Simulation steps per second
+        max_seconds: Game time limit
+        workers: Worker processes; None uses every core
+    Returns:
+        One {'params', 'games', 'summary'} dict per configuration, in order
+    """
+    tasks = [(config.to_dict(), policy, seed + i, tick_rate, max_seconds)
+             for config in configs for i in range(games)]
+    workers = workers or os.cpu_count() or 1
+    with ProcessPoolExecutor(max_workers=workers) as executor:
+        chunk = max(1, len(tasks) // (workers * 8))  # Big enough to amortize pickling, small enough to balance
+        results = list(executor.map(play_game, *zip(*tasks), chunksize=chunk))
+
+    return [{'params': config.to_dict(),
+             'games': results[index * games:(index + 1) * games],
+             'summary': summarize(results[index * games:(index + 1) * games])}
+            for index, config in enumerate(configs)]
+
+
+def write_csv(path: str, results: list):
+    """One row per game: configuration number, its parameters and the game's metrics"""
+    with open(path, 'w', newline='') as f:
+        writer = csv.writer(f)
+        writer.writerow(['config', *DifficultyParams.FIELDS, 'seed', *METRICS, 'survived'])
+        for index, result in enumerate(results):
+            params = [result['params'][name] for name in DifficultyParams.FIELDS]
+            for game in result['games']:
+                writer.writerow([index, *params, game['seed'], *(game[metric] for metric in METRICS),
+                                 int(game['survived'])])
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Play headless games across a difficulty sweep")
+    parser.add_argument('--games', type=int, default=100, help="Games per configuration")
+    parser.add_argument('--sweep', action='append', default=[], metavar='NAME=V1,V2,...',
+                        help=f"Values to try for one of: {', '.join(DifficultyParams.FIELDS)}; "
+                             "repeat for a grid over several")
+    parser.add_argument('--policy', choices=POLICIES, default='scripted')
+    parser.add_argument('--seed', type=int, default=1)
+    parser.add_argument('--tick-rate', type=int, default=TICK_RATE)
+    parser.add_argument('--max-seconds', type=float, default=MAX_GAME_SECONDS,
+                        help="Game time after which a game is stopped and counted as survived")
+    parser.add_argument('--workers', type=int, help="Worker processes (default: one per core)")
+    parser.add_argument('-o', '--output', help="Write every game to .csv, or games and summaries to .json")
+    args = parser.parse_args(argv)
+    try:
+        configs = parse_sweep(args.sweep)
+    except ValueError as e:
+        parser.error(str(e))
+
+    start = time.perf_counter()
+    results = run_sweep(configs, args.games, args.policy, args.seed, args.tick_rate, args.max_seconds,
+                        args.workers)
+    elapsed = time.perf_counter() - start
+
+    swept = [spec.partition('=')[0] for spec in args.sweep]
+    print(f"{'config':<8}" + ''.join(f"{name:>18}" for name in swept) +
+          f"{'survival p50':>14}{'p90':>8}{'level p50':>11}{'score p50':>11}{'survived':>10}")
+    for index, result in enumerate(results):
+        summary = result['summary']
+        print(f"{index:<8}" + ''.join(f"{result['params'][name]:>18}" for name in swept) +
+              f"{summary['survival_seconds']['p50']:>13.1f}s{summary['survival_seconds']['p90']:>7.1f}s"
+              f"{summary['level']['p50']:>11}{summary['score']['p50']:>11}"
+              f"{summary['survived']:>6}/{summary['games']}")
+    print(f"\n{len(configs) * args.games} games in {elapsed:.1f}s")
+
+    if args.output:
+        if os.path.splitext(args.output)[1].lower() == '.csv':
+            write_csv(args.output, results)
+        else:
+            with open(args.output, 'w') as f:
+                json.dump({
+                    'commit': git_commit(),
+                    'policy': args.policy,
+                    'seed': args.seed,
+                    'tick_rate': args.tick_rate,
+                    'max_seconds': args.max_seconds,
+                    'configs': results
+                }, f, indent=2)
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
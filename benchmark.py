@@ -0,0 +1,348 @@
+# Standard library imports
+import argparse
+import json
+import os
+import platform
+import random
+import subprocess
+import sys
+import time
+import tracemalloc
+
+# Game imports
+from particles import MAX_PARTICLES, ParticleSystem
+from projectiles import BULLET
+from simulation import AIM, FIRE, SWITCH, WINDOW_HEIGHT, WINDOW_WIDTH, World
+
+# Bumped when the report layout changes
+REPORT_VERSION = 1
+
+# Subprocesses run here so the game modules import, and git finds this repo, from any directory
+SOURCE_DIR = os.path.dirname(os.path.abspath(__file__))
+
+# Import paths timed by --startup, each in a fresh interpreter. The headless
+# path fails if anything it imports pulls in Kivy.
+STARTUP_PATHS = {
+    'interpreter': "pass",
+    'headless': ("import sys, main, simulation, replay, storage, benchmark, balance, vec_env; "
+                 "assert not any(name.startswith('kivy') for name in sys.modules), 'Kivy was imported'"),
+    'kivy': "import game_widget"
+}
+
+
+def fill_balls(world: World, count: int, rng: random.Random):
+    """Top the world up to `count` balls spread over the upper playfield"""
+    while len(world.balls) < count:
+        pos = (rng.uniform(100, world.width - 100), rng.uniform(world.height / 2, world.height))
+        world.balls.add(pos, [rng.uniform(0.5, 1), rng.uniform(0.5, 1), rng.uniform(0.5, 1), 1])
+
+
+def recycle_fallen_balls(world: World):
+    # Balls reaching the bottom would end the game; send them back to the top
+    y = world.balls.pos[:world.balls.count, 1]
+    y[y < 0] = world.height
+
+
+# Each scenario is (description, setup, prepare). setup(world, particles, rng)
+# runs once; prepare(world, particles, rng, tick) runs untimed before every
+# tick and returns that tick's inputs.
+
+def setup_idle(world, particles, rng):
+    pass
+
+
+def prepare_idle(world, particles, rng, tick):
+    recycle_fallen_balls(world)
+    return ()
+
+
+def setup_balls(world, particles, rng):
+    for _ in range(500):
+        world.balls.add((rng.uniform(100, world.width - 100), rng.uniform(0, world.height)), [1, 1, 1, 1])
+
+
+def prepare_balls(world, particles, rng, tick):
+    fill_balls(world, 500, rng)
+    recycle_fallen_balls(world)
+    if tick % 10 == 0:
+        x, y = world.balls.position(rng.randrange(len(world.balls)))
+        return [(AIM, (round(x + 20), round(y))), (FIRE, None)]
+    return ()
+
+
+def setup_auto_aim(world, particles, rng):
+    setup_balls(world, particles, rng)
+    world.activate_power_up('auto_aim', 3600)
+
+
+def prepare_auto_aim(world, particles, rng, tick):
+    # The solver runs every tick while the bullet is ready, and again on each shot
+    fill_balls(world, 500, rng)
+    recycle_fallen_balls(world)
+    return [(FIRE, None)] if tick % 10 == 0 else ()
+
+
+def setup_bullets(world, particles, rng):
+    world.activate_power_up('rapid_fire', 3600)
+
+
+def prepare_bullets(world, particles, rng, tick):
+    # Rapid fire plus extra launches keep 500 bullets in flight against a full screen
+    fill_balls(world, 15, rng)
+    recycle_fallen_balls(world)
+    while len(world.projectiles) < 500:
+        world.projectiles.add(BULLET, (rng.uniform(0, world.width), 60),
+                              (rng.uniform(-20, 20), rng.uniform(20, 60)))
+    return [(FIRE, None)]
+
+
+def setup_missiles(world, particles, rng):
+    world.apply_input(SWITCH, None)
+
+
+def prepare_missiles(world, particles, rng, tick):
+    # 20 missile blasts per second, each hitting a full screen of balls
+    fill_balls(world, 15, rng)
+    recycle_fallen_balls(world)
+    world.missile_number = 99
+    if tick % max(1, world.tick_rate // 20) == 0:
+        return [(FIRE, None)]
+    return ()
+
+
+def setup_particles(world, particles, rng):
+    particles.emit((world.width / 2, world.height / 2), [1, 0.5, 0, 1], 10000, spread=4)
+
+
+def prepare_particles(world, particles, rng, tick):
+    recycle_fallen_balls(world)
+    if particles.count < 10000:
+        particles.emit((rng.uniform(0, world.width), rng.uniform(0, world.height)),
+                       [1, 0.5, 0, 1], 10000 - particles.count, spread=4)
+    return ()
+
+
+def setup_level_50(world, particles, rng):
+    world.level = 50
+    world.update_difficulty()
+
+
+def prepare_level_50(world, particles, rng, tick):
+    recycle_fallen_balls(world)
+    if tick % 10 == 0 and world.balls:
+        x, y = world.balls.position(0)
+        return [(AIM, (round(x + 20), round(y))), (FIRE, None)]
+    return ()
+
+
+SCENARIOS = {
+    'idle': ("Level 1 game with no input", setup_idle, prepare_idle),
+    'balls_500': ("500 balls on screen, a bullet every 10 ticks", setup_balls, prepare_balls),
+    'auto_aim_500': ("Auto aim solving 500 balls every tick", setup_auto_aim, prepare_auto_aim),
+    'bullets_500': ("500 bullets in flight with rapid fire", setup_bullets, prepare_bullets),
+    'missiles_20_per_second': ("20 missile explosions per second", setup_missiles, prepare_missiles),
+    'particles_10k': ("10k live explosion particles", setup_particles, prepare_particles),
+    'level_50': ("Level 50 spawn rates and speeds", setup_level_50, prepare_level_50)
+}
+
+
+class Harness:
+    """One headless game plus the particles a front-end would keep for it
+
+    A tick is a World.step(), turning its explosion events into particles,
+    advancing the particles and building their vertex data: the per-tick
+    work of CannonGame.update() minus the Kivy calls.
+    """
+    def __init__(self, scenario: str, seed: int, tick_rate: int):
+        """
+        Initialize a harness
+        Args:
+            scenario: Key in SCENARIOS
+            seed: Seed for the world, the particles and the scenario's own choices
+            tick_rate: Simulation steps per second
+        """
+        self.world = World(WINDOW_WIDTH, WINDOW_HEIGHT, seed=seed, tick_rate=tick_rate)
+        self.world.end_grace_period()
+        self.particles = ParticleSystem(capacity=MAX_PARTICLES, seed=seed)
+        self.rng = random.Random(seed)
+        self.description, setup, self.prepare = SCENARIOS[scenario]
+        setup(self.world, self.particles, self.rng)
+        self.game_over_at = None
+
+    def inputs(self, tick: int):
+        return self.prepare(self.world, self.particles, self.rng, tick)
+
+    def tick(self, inputs):
+        world = self.world
+        particles = self.particles
+        world.step(inputs)
+        for event in world.drain_events():
+            if event[0] == 'explosions':
+                particles.explode_all(*event[1:])
+        particles.update(world.time_scale)
+        particles.mesh_data()
+
+    def check_game_over(self, tick: int):
+        if self.world.game_over and self.game_over_at is None:
+            self.game_over_at = tick
+
+
+def percentile(samples: list, q: float) -> float:
+    ordered = sorted(samples)
+    return ordered[round((len(ordered) - 1) * q)]
+
+
+def run_scenario(name: str, ticks: int, seed: int, tick_rate: int) -> dict:
+    """
+    Run a scenario twice: once for timing, once under tracemalloc
+    Args:
+        name: Key in SCENARIOS
+        ticks: Number of timed ticks
+        seed: Seed shared by both runs, so they do the same work
+        tick_rate: Simulation steps per second
+    Returns:
+        Timing and allocation figures for the report
+    """
+    harness = Harness(name, seed, tick_rate)
+    times = []
+    for tick in range(ticks):
+        inputs = harness.inputs(tick)
+        start = time.perf_counter()
+        harness.tick(inputs)
+        times.append((time.perf_counter() - start) * 1000)
+        harness.check_game_over(tick)
+
+    # Tracing slows everything down, so allocations get their own run
+    traced = Harness(name, seed, tick_rate)
+    allocated = retained = 0
+    tracemalloc.start()
+    try:
+        for tick in range(ticks):
+            inputs = traced.inputs(tick)
+            tracemalloc.reset_peak()
+            before = tracemalloc.get_traced_memory()[0]
+            traced.tick(inputs)
+            current, peak = tracemalloc.get_traced_memory()
+            allocated += peak - before
+            retained += current - before
+    finally:
+        tracemalloc.stop()
+
+    return {
+        'description': harness.description,
+        'ticks': ticks,
+        'ms_per_tick': sum(times) / ticks,
+        'p50_ms': percentile(times, 0.5),
+        'p95_ms': percentile(times, 0.95),
+        'max_ms': max(times),
+        'alloc_bytes_per_tick': allocated / ticks,
+        'retained_bytes_per_tick': retained / ticks,
+        'balls': len(harness.world.balls),
+        'particles': harness.particles.count,
+        'score': harness.world.score,
+        'game_over_at': harness.game_over_at,
+        'pools': dict(harness.world.pool_stats(), particles=harness.particles.stats())
+    }
+
+
+def measure_startup(code: str, repeat: int = 3) -> float:
+    """Fastest of `repeat` fresh-interpreter runs of `code` in milliseconds, or None if it fails"""
+    env = dict(os.environ, KIVY_NO_ARGS='1')
+    best = None
+    for _ in range(repeat):
+        start = time.perf_counter()
+        result = subprocess.run([sys.executable, '-c', code], capture_output=True, text=True, env=env,
+                                cwd=SOURCE_DIR)
+        elapsed = (time.perf_counter() - start) * 1000
+        if result.returncode != 0:
+            print(result.stderr.strip().splitlines()[-1] if result.stderr.strip() else "startup run failed")
+            return None
+        best = elapsed if best is None else min(best, elapsed)
+    return best
+
+
+def git_commit() -> str:
+    try:
+        result = subprocess.run(['git', 'rev-parse', '--short', 'HEAD'],
+                                capture_output=True, text=True, check=True, cwd=SOURCE_DIR)
+        return result.stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+def compare(report: dict, baseline: dict, tolerance: float) -> bool:
+    """Print per-scenario changes against a baseline; False if any tick got slower than allowed"""
+    ok = True
+    print(f"\nvs {baseline.get('commit') or 'baseline'}:")
+    for name, result in report['scenarios'].items():
+        base = baseline.get('scenarios', {}).get(name)
+        if base is None:
+            print(f"  {name:<24} (new)")
+            continue
+        change = result['ms_per_tick'] / base['ms_per_tick'] - 1
+        flag = ''
+        if tolerance is not None and change > tolerance:
+            flag = '  REGRESSION'
+            ok = False
+        print(f"  {name:<24}{base['ms_per_tick']:>9.3f} -> {result['ms_per_tick']:>9.3f} ms"
+              f"  {change:+7.1%}{flag}")
+    return ok
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Headless stress benchmarks for the Cannon Game loop")
+    parser.add_argument('scenarios', nargs='*', metavar='scenario',
+                        help=f"Scenarios to run (default: all of {', '.join(SCENARIOS)})")
+    parser.add_argument('--ticks', type=int, default=600, help="Ticks per scenario")
+    parser.add_argument('--seed', type=int, default=1)
+    parser.add_argument('--tick-rate', type=int, default=60)
+    parser.add_argument('-o', '--output', help="Write the JSON report here")
+    parser.add_argument('--compare', help="Baseline JSON report to compare against")
+    parser.add_argument('--tolerance', type=float,
+                        help="Fail if ms/tick grows by more than this fraction over the baseline")
+    parser.add_argument('--startup', action='store_true',
+                        help="Also time importing the headless and the Kivy code paths")
+    args = parser.parse_args(argv)
+    unknown = [name for name in args.scenarios if name not in SCENARIOS]
+    if unknown:
+        parser.error(f"unknown scenario: {', '.join(unknown)}")
+
+    report = {
+        'version': REPORT_VERSION,
+        'commit': git_commit(),
+        'python': platform.python_version(),
+        'platform': platform.platform(),
+        'seed': args.seed,
+        'tick_rate': args.tick_rate,
+        'scenarios': {}
+    }
+    print(f"{'scenario':<24}{'ms/tick':>9}{'p95':>9}{'max':>9}{'KiB/tick':>10}")
+    for name in args.scenarios or SCENARIOS:
+        result = run_scenario(name, args.ticks, args.seed, args.tick_rate)
+        report['scenarios'][name] = result
+        note = f"  game over at tick {result['game_over_at']}" if result['game_over_at'] is not None else ''
+        print(f"{name:<24}{result['ms_per_tick']:>9.3f}{result['p95_ms']:>9.3f}{result['max_ms']:>9.3f}"
+              f"{result['alloc_bytes_per_tick'] / 1024:>10.1f}{note}")
+
+    if args.startup:
+        report['startup_ms'] = {}
+        print(f"\n{'startup':<24}{'ms':>9}")
+        for name, code in STARTUP_PATHS.items():
+            elapsed = measure_startup(code)
+            report['startup_ms'][name] = elapsed
+            print(f"{name:<24}{elapsed:>9.1f}" if elapsed is not None else f"{name:<24}{'failed':>9}")
+
+    if args.output:
+        with open(args.output, 'w') as f:
+            json.dump(report, f, indent=2)
+
+    if args.compare:
+        with open(args.compare, 'r') as f:
+            baseline = json.load(f)
+        if not compare(report, baseline, args.tolerance):
+            return 1
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
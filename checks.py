@@ -0,0 +1,123 @@
+# Standard library imports
+import argparse
+import os
+import sys
+import tempfile
+import threading
+
+# Game imports; all headless, so the checks run without a window or audio
+from assets import SoundBank
+from replay import Replay, ReplayRecorder, verify, write_varint
+from simulation import AIM, FIRE, World
+from storage import HighScoreStore
+
+
+def check_mid_game_high_score():
+    """A record beaten mid-game is raised at once and written by the periodic flush"""
+    with tempfile.TemporaryDirectory(prefix='cannon-checks-') as directory:
+        store = HighScoreStore(os.path.join(directory, 'high_score.json'), interval=0)
+        world = World(seed=1, high_score=5)
+        world.score = 5
+        world.balls.add((200, 300), [1, 0, 0, 1])
+        world.handle_ball_hit(0)
+        events = world.drain_events()
+        assert ('high_score',) in events, events
+        assert world.high_score == world.score == 6, (world.high_score, world.score)
+        assert not world.game_over
+
+        # What the front-end does with the flag, then once per frame
+        store.set(world.high_score)
+        store.maybe_flush()
+        assert store.writes == 1, store.writes
+        assert HighScoreStore(store.path).score == 6
+
+
+def check_negative_seed_replay():
+    """A game seeded with a negative number saves and replays like any other"""
+    world = World(seed=-12345)
+    recorder = ReplayRecorder(world)
+    for step in range(600):
+        inputs = [(AIM, (100 + step % 400, 300)), (FIRE, None)] if step % 30 == 0 else []
+        recorder.record(inputs)
+        world.step(inputs)
+    replay = Replay.from_bytes(recorder.finish(world).to_bytes())
+    assert replay.seed == -12345, replay.seed
+    assert verify(replay)
+
+    # Raw varints stay unsigned; a negative one is refused instead of garbled
+    try:
+        write_varint(bytearray(), -1)
+    except ValueError:
+        pass
+    else:
+        raise AssertionError("write_varint accepted -1")
+
+
+def check_sounds_decode_on_dispatch_thread():
+    """The sound loader runs only where dispatch delivers, one voice per frame, never on the worker"""
+    class FakeSound:
+        state = 'stop'
+
+    decoded = []  # (thread, file name) per loader call
+
+    def loader(path):
+        decoded.append((threading.current_thread(), os.path.basename(path)))
+        return FakeSound()
+
+    with tempfile.TemporaryDirectory(prefix='cannon-checks-') as directory:
+        files = {}
+        for name in ('pop', 'bullet'):
+            files[name] = os.path.join(directory, f'{name}.wav')
+            with open(files[name], 'wb') as f:
+                f.write(b'RIFF')
+        files['absent'] = os.path.join(directory, 'absent.wav')
+
+        # A stand-in for Clock.schedule_once: callbacks queue for the next frame
+        scheduled = []
+        bank = SoundBank(files, loader, priority=('bullet',), polyphony={'pop': 2},
+                         dispatch=lambda callback, *args: scheduled.append((callback, args)))
+        bank.start()
+        bank.thread.join()
+        assert not decoded, "decoded on the worker thread"
+        assert bank.loading and not bank.sounds
+
+        frames = 0
+        while scheduled and frames < 10:
+            frame, scheduled[:] = list(scheduled), []
+            before = len(decoded)
+            for callback, args in frame:
+                callback(*args)
+            assert len(decoded) - before <= 1, f"{len(decoded) - before} decodes in one frame"
+            frames += 1
+        main = threading.current_thread()
+        assert decoded == [(main, 'bullet.wav'), (main, 'pop.wav'), (main, 'pop.wav')], decoded
+        assert set(bank.sounds) == {'pop', 'bullet'}, bank.sounds
+        assert len(bank.voices['pop'].voices) == 2
+        assert bank.missing == ['absent'], bank.missing
+        assert not bank.loading and not scheduled
+
+
+CHECKS = [check_mid_game_high_score, check_negative_seed_replay, check_sounds_decode_on_dispatch_thread]
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Run the headless regression checks")
+    parser.add_argument('names', nargs='*', help="Checks to run; default all")
+    args = parser.parse_args(argv)
+
+    failed = 0
+    for check in CHECKS:
+        if args.names and check.__name__ not in args.names:
+            continue
+        try:
+            check()
+        except Exception as e:
+            failed += 1
+            print(f"FAILED {check.__name__}: {e!r}")
+        else:
+            print(f"ok     {check.__name__}")
+    return 1 if failed else 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,47 @@
+# Third-party imports
+import numpy as np
+
+# Game imports
+from arrays import ParallelArrays
+
+
+class EnemyArray(ParallelArrays):
+    """Enemies of one kind stored as parallel NumPy arrays, in spawn order
+
+    The world moves every live enemy in one vectorized step. Removal keeps
+    the remaining enemies in spawn order, which decides who a bullet hits
+    when it overlaps several. Each enemy also gets a unique id, letting
+    renderers tell a new enemy from one that moved.
+    """
+    COLUMNS = (
+        ('pos', (2,), float),
+        ('color', (4,), float),
+        ('ids', (), np.int64)
+    )
+
+    def __init__(self, size: tuple[float, float], capacity: int):
+        """
+        Initialize an enemy array
+        Args:
+            size: (width, height) shared by every enemy of this kind
+            capacity: Rows allocated up front; more are added when it runs out
+        """
+        super().__init__(capacity)
+        self.size = size
+        self.next_id = 1
+
+    def add(self, pos, color) -> int:
+        """Append an enemy and return its index"""
+        index = self.append(pos, color, self.next_id)
+        self.next_id += 1
+        return index
+
+    def position(self, index: int) -> tuple[float, float]:
+        return tuple(self.pos[index].tolist())
+
+    def overlaps(self, boxes, size):
+        """(n, count) boolean matrix of the enemies overlapped by each of n boxes of one size"""
+        pos = self.pos[:self.count]
+        x, y = boxes[:, 0:1], boxes[:, 1:2]
+        return ((x < pos[:, 0] + self.size[0]) & (x + size[0] > pos[:, 0]) &
+                (y < pos[:, 1] + self.size[1]) & (y + size[1] > pos[:, 1]))
@@ -0,0 +1,107 @@
+# Third-party imports
+import numpy as np
+
+
+class EventQueue:
+    """Side effects raised by the game rules, merged until the front-end drains them
+
+    Rules only record what happened; nothing is played or drawn while a tick
+    runs. Between drains a sound raised many times is kept once, a flag such
+    as a power-up change is kept once however often it is raised, and every
+    explosion is collected into one batch of arrays; a front-end can take
+    that batch each tick with take_explosions() so particles start on time.
+    A missile clearing thirty balls then costs the front-end one sound and
+    one particle burst, about what a single ball costs.
+    """
+    def __init__(self):
+        # Dicts keep the order names were first raised in
+        self.sounds = {}
+        self.flags = {}
+        self.explosion_pos = []
+        self.explosion_color = []
+        self.explosion_big = []
+        self.raised = 0
+        self.delivered = 0
+
+    def __len__(self) -> int:
+        return len(self.sounds) + len(self.flags) + (1 if self.explosion_pos else 0)
+
+    def sound(self, name: str):
+        self.raised += 1
+        self.sounds[name] = None
+
+    def flag(self, kind: str):
+        """Raise an event that carries no data, like 'high_score' or 'game_over'"""
+        self.raised += 1
+        self.flags[kind] = None
+
+    def explosion(self, pos, color, big: bool = False):
+        """
+        Queue one explosion
+        Args:
+            pos: (x, y) center of the burst
+            color: RGBA color of its particles
+            big: Whether it is a missile blast, which is bigger and spreads wider
+        """
+        self.raised += 1
+        self.explosion_pos.append(pos)
+        self.explosion_color.append(color)
+        self.explosion_big.append(big)
+
+    def explosions(self, pos, color, big: bool = False):
+        """
+        Queue explosions of one color at many points
+        Args:
+            pos: (n, 2) array of burst centers
+            color: RGBA color shared by every burst
+            big: Whether they are missile blasts
+        """
+        n = len(pos)
+        self.raised += n
+        self.explosion_pos.extend(pos.tolist())
+        self.explosion_color.extend([color] * n)
+        self.explosion_big.extend([big] * n)
+
+    def clear(self):
+        self.sounds.clear()
+        self.flags.clear()
+        self.explosion_pos.clear()
+        self.explosion_color.clear()
+        self.explosion_big.clear()
+
+    def take_explosions(self):
+        """
+        Return and clear just the queued explosions, leaving sounds and flags to drain()
+        Returns:
+            (pos, color, big) arrays as in drain()'s batch, or None if there are none
+        """
+        if not self.explosion_pos:
+            return None
+        explosions = (np.array(self.explosion_pos, np.float32),
+                      np.array(self.explosion_color, np.float32),
+                      np.array(self.explosion_big, bool))
+        self.explosion_pos.clear()
+        self.explosion_color.clear()
+        self.explosion_big.clear()
+        self.delivered += 1
+        return explosions
+
+    def drain(self) -> list:
+        """
+        Return the merged events raised since the last call and clear the queue
+        Returns:
+            ('sound', name) once per distinct sound, one
+            ('explosions', pos, color, big) batch of (n, 2), (n, 4) and (n,)
+            arrays, then each flag as a 1-tuple in the order first raised
+        """
+        events = [('sound', name) for name in self.sounds]
+        explosions = self.take_explosions()
+        if explosions is not None:
+            events.append(('explosions', *explosions))
+        events.extend((kind,) for kind in self.flags)
+        self.delivered += len(self.sounds) + len(self.flags)
+        self.clear()
+        return events
+
+    def stats(self) -> dict:
+        return {'raised': self.raised, 'delivered': self.delivered}
@@ -0,0 +1,877 @@
+# Standard library imports
+import os
+import time
+
+# Third-party imports
+import numpy as np
+
+# Game imports
+from simulation import (
+    AIM, BALL_POOL_SIZE, COLORS, FIRE, MOVE_LEFT, MOVE_RIGHT, POWER_UP_POOL_SIZE, PROJECTILE_CAPACITY,
+    RESIZE, SWITCH, TICK_RATE, TURN_LEFT, TURN_RIGHT, WINDOW_HEIGHT, WINDOW_WIDTH, World
+)
+
+# Kivy imports; the window size has to be configured before the window module loads
+from kivy.config import Config
+Config.set('graphics', 'width', str(WINDOW_WIDTH))
+Config.set('graphics', 'height', str(WINDOW_HEIGHT))
+
+from kivy.app import App
+from kivy.clock import Clock
+from kivy.core.audio import SoundLoader
+from kivy.core.window import Window
+from kivy.graphics import Color, Ellipse, InstructionGroup, Line, Rectangle, RoundedRectangle
+from kivy.uix.button import Button
+from kivy.uix.label import Label
+from kivy.uix.widget import Widget
+
+# Game imports (Kivy front-end)
+from assets import SoundBank
+from hud import Hud
+from particles import ParticleSystem
+from profiler import FrameProfiler, call
+from rendering import (
+    RECT_OUTLINE, ShapeBatch, circle_outline, count_instructions, create_colored_mesh, update_mesh
+)
+from replay import Replay, ReplayRecorder
+from storage import HighScoreStore, SaveStore
+from trajectory import TrajectoryCache
+
+# Longest frame the game loop catches up on; slower frames slow the game down
+# instead of running an ever-growing number of ticks
+MAX_FRAME_TIME = 0.25
+
+# Finished games are recorded here for later verification
+REPLAY_DIR = 'replays'
+
+SOUND_FILES = {
+    'background': 'background.wav',
+    'bullet': 'bullet.wav',
+    'missile': 'missile.wav',
+    'pop': 'pop.wav',
+    'game_over': 'gameOver.wav'
+}
+SOUND_PRIORITY = ('bullet', 'pop', 'missile', 'game_over')
+SOUND_POLYPHONY = {'bullet': 3, 'pop': 4, 'missile': 2}  # Voices per effect; others get one
+
+# Frames between refreshes of the profiler overlay text
+PROFILER_REFRESH = 15
+
+
+class CannonGame(Widget):
+    """Kivy front-end that renders a World and feeds it player input
+
+    The world advances in fixed ticks of 1 / tick_rate seconds. Each frame
+    adds the elapsed time to an accumulator and runs as many ticks as fit,
+    so game speed no longer depends on how often Kivy calls update().
+
+    Every game is recorded as its seed plus per-tick input and saved to
+    REPLAY_DIR when it ends. Given a replay, the widget plays it back at 1x
+    instead of taking player input.
+    """
+    def __init__(self, tick_rate: int = TICK_RATE, seed: int = None, replay: Replay = None, **kwargs):
+        super().__init__(**kwargs)
+        self.replay = replay
+
+        # Save files and the high score are written off the UI thread
+        self.storage = SaveStore(dispatch=self.dispatch_to_clock)
+        self.high_scores = HighScoreStore(executor=self.storage.executor)
+
+        if replay is not None:
+            self.world = replay.create_world()
+            self.world.high_score = self.high_scores.score
+        else:
+            self.world = World(Window.width, Window.height, high_score=self.high_scores.score,
+                               seed=seed, tick_rate=tick_rate)
+        self.setup_game_state()
+        self.setup_ui()
+        self.setup_game_objects()
+        self._keyboard = Window.request_keyboard(self._keyboard_closed, self)
+        self._keyboard.bind(on_key_down=self._on_keyboard_down)
+        self.bind_events()  # Keep only one instance
+        Clock.schedule_interval(self.update, 0)  # Every frame; ticks are paced by update()
+
+        with self.canvas.after:
+            self.trajectory_line = Line(points=[], width=2, color=COLORS['accent'])
+
+
+
+    def setup_ui(self):
+        self.setup_labels()
+        self.setup_buttons()
+        self.setup_game_elements()
+        self.help_clicked = False  # Initialize help state
+
+    def setup_labels(self):
+        # Modern label style with shadow effect
+        label_style = {
+            'font_size': 24,
+            'color': COLORS['text'],
+            'bold': True,
+            'outline_width': 1,
+            'outline_color': [0, 0, 0, 0.5]
+        }
+
+        # Game Title
+        self.title_label = Label(
+            text="CANNON SHOOTER",
+            pos=(Window.width / 2 - 150, Window.height - 100),
+            font_size=48,
+            color=COLORS['primary'],
+            bold=True,
+            outline_width=2,
+            outline_color=[0, 0, 0, 0.5]
+        )
+        self.add_widget(self.title_label)
+
+        # Score Panel (Top Left)
+        score_panel_y = Window.height - 120
+        self.score_label = Label(
+            text="Score: 0",
+            pos=(30, score_panel_y),
+            **label_style
+        )
+        self.add_widget(self.score_label)
+
+        self.level_label = Label(
+            text="Level: 1",
+            pos=(30, score_panel_y - 40),
+            **label_style
+        )
+        self.add_widget(self.level_label)
+
+        self.missile_label = Label(
+            text=f"Missiles: {self.world.missile_number}",
+            pos=(30, score_panel_y - 80),
+            **label_style
+        )
+        self.add_widget(self.missile_label)
+
+        # Status Panel (Top Right)
+        status_panel_y = Window.height - 120
+        self.high_score_label = Label(
+            text=f"High Score: {self.world.high_score}",
+            pos=(Window.width - 200, status_panel_y),
+            **label_style
+        )
+        self.add_widget(self.high_score_label)
+
+        # Power-up Status with modern styling
+        self.power_up_status = Label(
+            text="",
+            pos=(Window.width - 200, status_panel_y - 60),
+            font_size=20,
+            color=COLORS['warning'],
+            bold=True,
+            outline_width=1,
+            outline_color=[0, 0, 0, 0.3]
+        )
+        self.add_widget(self.power_up_status)
+
+        # Help text (left side, initially hidden)
+        self.help_label = Label(
+            text="",
+            pos=(200, Window.height / 2 - 300),  # Moved right by adjusting x coordinate
+            size_hint=(None, None),
+            color=COLORS['text'],
+            font_size=16,  # Slightly smaller font for better fit
+            halign='left',
+            valign='middle',
+            width=300  # Fixed width for better text wrapping
+        )
+        self.help_label.bind(texture_size=self.help_label.setter('size'))
+        self.add_widget(self.help_label)
+
+        # Overlay labels, added to the widget only while their overlay is shown
+        self.pause_label = Label(
+            text="PAUSED\nClick Pause to Continue",
+            font_size=36,
+            color=[1, 1, 1, 1],
+            bold=True,
+            halign='center'
+        )
+        self.game_over_label = Label(
+            text="",
+            font_size=36,
+            color=[1, 1, 1, 1],
+            bold=True,
+            outline_width=2,
+            outline_color=[0, 0, 0, 0.5],
+            halign='center'
+        )
+
+        # Per-frame values go through the HUD so unchanged text is never re-rendered
+        self.hud.add('score', self.score_label, 'Score: {}'.format, 0)
+        self.hud.add('level', self.level_label, 'Level: {}'.format, 1)
+        self.hud.add('missiles', self.missile_label, 'Missiles: {}'.format, self.world.missile_number)
+        self.hud.add('power_ups', self.power_up_status, "\n".join, ())
+        self.hud.add('high_score', self.high_score_label, 'High Score: {}'.format, self.world.high_score)
+
+    def setup_buttons(self):
+        # Modern button style with gradient effect
+        button_style = {
+            'size_hint': (None, None),
+            'size': (140, 45),
+            'background_color': [*COLORS['primary'][:3], 0.9],
+            'color': COLORS['background'],
+            'bold': True,
+            'font_size': 18,
+            'border': (0, 0, 0, 0),
+            'background_normal': ''
+        }
+
+        # Button panel on the left side
+        button_x = 30
+        button_start_y = Window.height - 250
+        button_spacing = 60
+
+        buttons = [
+            ('Pause', self.toggle_pause),  # Add pause button
+            ('Help', self.show_help),
+            ('Restart', self.reset_game),
+            ('Save Game', self.save_game),
+            ('Load Game', self.load_game)
+        ]
+
+        for idx, (text, callback) in enumerate(buttons):
+            btn = Button(
+                text=text,
+                pos=(button_x, button_start_y - (idx * button_spacing)),
+                **button_style
+            )
+            # Add hover effect
+            btn.bind(
+                on_press=lambda btn: setattr(btn, 'background_color', [*COLORS['secondary'][:3], 0.9]),
+                on_release=lambda btn, cb=callback: (cb(btn), setattr(btn, 'background_color', [*COLORS['primary'][:3], 0.9]))
+            )
+            self.add_widget(btn)
+
+    def setup_game_elements(self):
+        world = self.world
+
+        # Draw background first
+        with self.canvas.before:
+            Color(*COLORS['background'])
+            self.background = Rectangle(pos=self.pos, size=Window.size)
+
+        # The pause overlay dims the background; its group is empty while unpaused
+        self.pause_overlay = InstructionGroup()
+        self.pause_shade = (Color(0, 0, 0, 0.5), Rectangle(pos=(0, 0)))
+        self.canvas.before.add(self.pause_overlay)
+
+        with self.canvas:
+            Color(*world.cannon_base.color)
+            self.cannon_base = RoundedRectangle(
+                pos=world.cannon_base.pos,
+                size=world.cannon_base.size,
+                radius=[5,]
+            )
+
+            Color(*world.cannon.color)
+            self.cannon = RoundedRectangle(
+                pos=world.cannon.pos,
+                size=world.cannon.size,
+                radius=[5,]
+            )
+
+            Color(*world.bullet.color)
+            self.bullet = RoundedRectangle(
+                pos=world.bullet.pos,
+                size=world.bullet.size,  # Increased bullet size
+                radius=[7,]  # Slightly larger radius for better appearance
+            )
+
+            Color(*world.missile.color)
+            self.missile = RoundedRectangle(
+                pos=world.missile.pos,
+                size=world.missile.size,
+                radius=[5,]
+            )
+
+        # Balls, power-ups and shots in flight reuse pre-allocated instructions
+        self.ball_batch = ShapeBatch(self.canvas, circle_outline(24), BALL_POOL_SIZE)
+        self.power_up_batch = ShapeBatch(self.canvas, RECT_OUTLINE, POWER_UP_POOL_SIZE)
+        self.projectile_batch = ShapeBatch(self.canvas, RECT_OUTLINE, PROJECTILE_CAPACITY)
+        # Size and color of each projectile kind, indexed by Projectiles.kind
+        self.projectile_sizes = np.array([world.bullet.size, world.missile.size])
+        self.projectile_colors = np.array([world.bullet.color, world.missile.color])
+
+        # All explosion particles are drawn by a single batched mesh
+        self.particle_mesh = create_colored_mesh(self.canvas)
+
+        # The shield is drawn over the cannon while it is active
+        self.shield_overlay = InstructionGroup()
+        self.shield_visual = (Color(0, 1, 1, 0.3), Ellipse(size=(80, 80)))
+        self.canvas.add(self.shield_overlay)
+
+        # The game over overlay covers the playfield, so it comes last
+        self.game_over_overlay = InstructionGroup()
+        self.game_over_shade = (Color(0, 0, 0, 0.7), Rectangle(pos=(0, 0)))
+        self.canvas.add(self.game_over_overlay)
+
+    def setup_game_state(self):
+        # Add pause state
+        self.paused = False
+
+        # Input collected from Kivy events, applied on the next world step
+        self.pending_inputs = []
+        self.mouse_pos = (0, 0)
+
+        # Unsimulated time carried over between frames
+        self.accumulator = 0.0
+
+        # Recording of the live game, or the position in the replay being watched
+        self.recorder = ReplayRecorder(self.world) if self.replay is None else None
+        self.replay_step = 0
+
+        # Label texts, flushed once per frame
+        self.hud = Hud()
+
+        # Visual-only state: explosion particles, seeded from the game
+        self.particles = ParticleSystem(seed=self.world.seed)
+
+        # Aim preview arcs, cached by quantized heading, speed and position
+        self.trajectories = TrajectoryCache()
+        self.trajectory_points = None
+
+        # Frame-time profiler, created while its overlay is shown (F3)
+        self.profiler = None
+        self.profiler_frames = 0
+
+    def setup_game_objects(self):
+        # Audio files are read in the background; effects heard most often come first
+        self.sound_bank = SoundBank(SOUND_FILES, SoundLoader.load, priority=SOUND_PRIORITY,
+                                    polyphony=SOUND_POLYPHONY, dispatch=self.dispatch_to_clock,
+                                    on_load=self.on_sound_loaded)
+        self.sounds = self.sound_bank.sounds
+        self.sound_bank.start()
+
+    def on_sound_loaded(self, sound_name, sound):
+        if sound_name == 'background':
+            sound.volume = 0.5
+            sound.loop = True
+            # Start background music once it is available
+            if not self.paused and not self.world.game_over:
+                sound.play()
+
+    def play_sound(self, sound_name):
+        self.sound_bank.play(sound_name)
+
+    def bind_events(self):
+        Window.bind(mouse_pos=self.on_mouse_pos)
+        Window.bind(on_mouse_down=self.on_mouse_down)
+        Window.bind(on_mouse_up=self.on_mouse_up)
+        Window.bind(size=self.on_window_size)
+
+    def on_window_size(self, window, size):
+        # Resizes go through the input queue so replays see them too
+        if self.replay is None:
+            self.pending_inputs.append((RESIZE, (int(size[0]), int(size[1]))))
+
+
+    @staticmethod
+    def dispatch_to_clock(callback, *args):
+        # Storage results and sounds to decode arrive from worker threads; run them on the next frame
+        Clock.schedule_once(lambda dt: callback(*args))
+
+    def save_game(self, instance):
+        if self.replay is not None:
+            print("Replays are not saved over the player's game")
+            return
+        # Snapshotting is cheap; encoding and writing happen in the background
+        self.storage.save(self.world.snapshot(), self.on_game_saved)
+
+    def on_game_saved(self, error):
+        if error is not None:
+            print(f"Could not save game: {error}")
+
+    def load_game(self, instance):
+        self.storage.load(self.on_game_loaded)
+
+    def on_game_loaded(self, state, error):
+        if isinstance(error, FileNotFoundError):
+            print("Save file not found")
+            return
+        if error is not None:
+            print(f"Could not load game: {error}")
+            return
+
+        # Swap in the saved game; SaveStore checked it, but a save that still
+        # fails to restore puts the current game back as it was
+        previous = self.world.snapshot()
+        try:
+            self.world.restore(state)
+        except (AttributeError, IndexError, KeyError, TypeError, ValueError) as e:
+            print(f"Could not load game: {e!r}")
+            self.world.restore(previous)
+            return
+
+        # Drop the old game's visuals and screens
+        self.paused = False
+        self.pending_inputs.clear()
+        self.hide_overlay(self.pause_overlay, self.pause_label)
+        self.hide_overlay(self.game_over_overlay, self.game_over_label)
+        self.clear_game_objects()
+        self.sync_canvas()
+        self.process_events()
+        self.accumulator = 0.0
+
+        # The game no longer follows from its seed and inputs
+        self.recorder = None
+
+        self.update_ui()
+        self.hud.flush()
+
+
+    def show_help(self, instance):
+        if self.help_clicked:
+            self.help_label.text = ""
+            self.help_clicked = False
+        else:
+            # Update help text position
+            self.help_label.pos = (200, Window.height / 2 - 300)  # Moved right and centered vertically
+
+            self.help_label.text = """🎮 Cannon SHOOTER - GAME GUIDE 🎮
+
+[[ GAME CONTROLS ]]
+• Mouse Controls:
+  - Left Click: Fire weapon
+  - Right Click: Switch between bullet/missile
+  - Mouse Movement: Aim cannon
+• Keyboard Controls:
+  - A/D keys: Move cannon left/right
+  - Left/Right arrows: Fine-tune aim
+  - Spacebar: Fire weapon
+  - F3: Show/hide frame-time profiler
+• Game Controls:
+  - Help Button: Show/hide this guide
+  - Pause Button: Pause/resume game
+  - Restart Button: Start new game
+  - Save/Load: Save or load game progress
+
+[[ OBJECTIVE ]]
+Defend your position by shooting incoming balls before they reach the bottom. Each successful hit increases your score and helps you level up!
+
+[[ WEAPONS SYSTEM ]]
+Primary Weapon - Bullets 🔫: Unlimited ammunition, Single target damage, Quick reload time, Affected by gravity
+Special Weapon - Missiles 🚀: Limited supply, Area damage effect, Destroys multiple targets, Earn 1 missile per 10 destroyed balls
+
+[[ POWER-UPS ]]
+Speed Boost 🟢: Doubles bullet speed (10s) | Shield 🔵: Blocks one missed ball (15s) | Double Score 🟡: Doubles all points (20s) | Auto Aim 🟣: Bullets lock onto the lowest ball (8s) | Rapid Fire 🟠: Reload in 0.1s, many bullets in flight (8s)
+
+[[ SCORING SYSTEM ]]
+Regular Hit: 1 point × combo multiplier | Missile Hit: 3 points (shared among targets) | Combo System: Consecutive hits increase points
+Max Combo: 10x multiplier | Combo Timer: 2 seconds between hits
+
+[[ PROGRESSION ]]
+Level Advancement: Every 15 points = New level | Higher levels increase: Ball spawn rate, Ball speed, Maximum balls on screen
+
+[[ PRO TIPS ]]
+Save missiles for emergency situations | Build and maintain combos for high scores | Collect power-ups strategically | Watch for ball patterns
+Practice aim prediction | Keep track of your shield timer
+
+🏆 Good luck, Commander! Beat that high score! 🏆"""
+        self.help_clicked = True
+
+
+    def queue_input(self, action, value=None):
+        # Input is buffered so the world applies it in tick order
+        if not self.paused and self.replay is None:
+            self.pending_inputs.append((action, value))
+
+    def next_inputs(self):
+        """Inputs for the next world step, from the player or the replay"""
+        if self.replay is not None:
+            inputs = self.replay.inputs.get(self.replay_step, ())
+            self.replay_step += 1
+            return inputs
+
+        inputs, self.pending_inputs = self.pending_inputs, []
+        if self.recorder is not None:
+            self.recorder.record(inputs)
+        return inputs
+
+    def shoot(self):
+        self.queue_input(FIRE)
+
+    def move_right(self):
+        self.queue_input(MOVE_RIGHT)
+
+    def move_left(self):
+        self.queue_input(MOVE_LEFT)
+
+    def turn_left(self):
+        self.queue_input(TURN_LEFT)
+
+    def turn_right(self):
+        self.queue_input(TURN_RIGHT)
+
+    def switch_bullet_missile(self):
+        self.queue_input(SWITCH)
+
+    def update_trajectory_line(self):
+        # The full flight path of the ready weapon; unchanged aims reuse the cached arc
+        points = self.trajectories.points(self.world)
+        if points is not self.trajectory_points:
+            self.trajectory_points = points
+            self.trajectory_line.points = points
+
+
+    def active_power_ups(self) -> tuple:
+        world = self.world
+        status = []
+        if world.bullet_speed_boost > 1:
+            status.append("Speed Boost")
+        if world.has_shield:
+            status.append("Shield Active")
+        if world.score_multiplier > 1:
+            status.append("Double Score")
+        if world.auto_aim:
+            status.append("Auto Aim")
+        if world.rapid_fire:
+            status.append("Rapid Fire")
+        return tuple(status)
+
+    def update_power_up_status(self):
+        status = self.active_power_ups()
+        self.hud.set('power_ups', status)
+        # Update color based on active power-ups
+        self.power_up_status.color = (1, 1, 0, 1) if status else (0.9, 0.9, 1, 1)
+
+    def update_shield_visual(self):
+        # The shield's instructions are reused; its group is empty while unshielded
+        if not self.world.has_shield:
+            self.shield_overlay.clear()
+            return
+        color, ellipse = self.shield_visual
+        if not self.shield_overlay.children:
+            self.shield_overlay.add(color)
+            self.shield_overlay.add(ellipse)
+
+        # Keep shield visual on the cannon
+        ellipse.pos = (self.cannon.pos[0] - 15, self.cannon.pos[1] - 15)
+
+    def on_mouse_pos(self, window, pos):
+        self.mouse_pos = pos
+        # Update cannon rotation based on mouse position
+        if not self.world.game_over:
+            # Whole pixels keep recorded aims exact and compact
+            self.queue_input(AIM, (round(pos[0]), round(pos[1])))
+
+    def on_mouse_down(self, window, x, y, button, modifiers):
+        if button == 'left':
+            self.shoot()
+        elif button == 'right':
+            self.switch_bullet_missile()
+
+    def on_mouse_up(self, window, x, y, button, modifiers):
+        pass
+
+    def update_particle_mesh(self):
+        # Particles advance with each world tick; this only uploads the frame
+        update_mesh(self.particle_mesh, *self.particles.mesh_data())
+
+    def sync_canvas(self):
+        world = self.world
+        self.cannon_base.pos = world.cannon_base.pos
+        self.cannon.pos = world.cannon.pos
+        # The loaded rounds sit on the cannon and disappear while reloading
+        self.bullet.pos = world.bullet.pos
+        self.bullet.size = world.bullet.size if world.bullet_state != 'fire' else (0, 0)
+        self.missile.pos = world.missile.pos
+        self.missile.size = world.missile.size if world.missile_state != 'fire' else (0, 0)
+        self.draw_batches()
+        self.update_shield_visual()
+
+    def draw_batches(self):
+        # One mesh each for all balls and all power-ups, rebuilt from arrays
+        balls = self.world.balls
+        self.ball_batch.draw(balls.pos[:balls.count], balls.size, balls.color[:balls.count])
+        power_ups = self.world.power_ups
+        self.power_up_batch.draw([power_up.pos for power_up in power_ups],
+                                 [power_up.size for power_up in power_ups],
+                                 [power_up.color for power_up in power_ups])
+        shots = self.world.projectiles
+        kinds = shots.kind[:shots.count]
+        self.projectile_batch.draw(shots.pos[:shots.count], self.projectile_sizes[kinds],
+                                   self.projectile_colors[kinds])
+
+    def pool_stats(self) -> dict:
+        """High-water marks of the world object pools and the drawing pools"""
+        stats = {f'world_{name}': value for name, value in self.world.pool_stats().items()}
+        stats['ball_batch'] = self.ball_batch.stats()
+        stats['power_up_batch'] = self.power_up_batch.stats()
+        stats['projectile_batch'] = self.projectile_batch.stats()
+        stats['particles'] = self.particles.stats()
+        return stats
+
+    def spawn_explosions(self):
+        # Bursts start on the tick that raised them, so that tick's particle update moves them
+        explosions = self.world.events.take_explosions()
+        if explosions is not None:
+            self.particles.explode_all(*explosions)
+
+    def process_events(self):
+        for event in self.world.drain_events():
+            kind = event[0]
+            if kind == 'sound':
+                self.play_sound(event[1])
+            elif kind == 'explosions':
+                self.particles.explode_all(*event[1:])
+            elif kind == 'power_up_status':
+                self.update_power_up_status()
+            elif kind == 'high_score':
+                # Records reached while watching someone else's replay are not the player's
+                if self.replay is None:
+                    self.high_scores.set(self.world.high_score)
+            elif kind == 'game_over':
+                self.end_game()
+        # Triggers of the same sound within a frame start one voice
+        self.sound_bank.flush()
+
+    def toggle_pause(self, instance=None):
+        self.paused = not self.paused
+        self.pending_inputs.clear()
+
+        if self.paused:
+            self.show_overlay(self.pause_overlay, self.pause_shade, self.pause_label)
+
+            # Pause background music if it exists
+            if 'background' in self.sounds and self.sounds['background'].state == 'play':
+                self.sounds['background'].stop()
+        else:
+            self.hide_overlay(self.pause_overlay, self.pause_label)
+
+            # Resume background music if it exists
+            if 'background' in self.sounds and not self.world.game_over:
+                self.sounds['background'].play()
+
+    def show_overlay(self, group, shade, label):
+        """Fill an overlay group with its shade and add its label; both are reused every time"""
+        color, rectangle = shade
+        rectangle.size = Window.size
+        if not group.children:
+            group.add(color)
+            group.add(rectangle)
+        label.pos = (Window.width / 2 - 150, Window.height / 2)
+        if label.parent is None:
+            self.add_widget(label)
+
+    def hide_overlay(self, group, label):
+        group.clear()
+        if label.parent is not None:
+            self.remove_widget(label)
+
+
+    def update(self, dt):
+        if self.world.game_over or self.paused:
+            return
+
+        try:
+            world = self.world
+            tick = 1 / world.tick_rate
+            self.accumulator = min(self.accumulator + dt, MAX_FRAME_TIME)
+            if self.accumulator < tick:
+                return
+
+            profiler = self.profiler
+            timed = profiler.measure if profiler is not None else call
+            if profiler is not None:
+                profiler.begin_frame()
+
+            while self.accumulator >= tick and not world.game_over:
+                if self.replay is not None and self.replay_step >= self.replay.steps:
+                    world.end_game()  # End of the recording
+                    break
+                # Input gathered during the frame goes to its first tick
+                world.step(self.next_inputs())
+                timed('spawn_explosions', self.spawn_explosions)
+                timed('step_particles', self.particles.update, world.time_scale)
+                self.accumulator -= tick
+
+            # Sounds and flags the ticks raised are merged and handled once per frame
+            timed('process_events', self.process_events)
+
+            timed('update_trajectory_line', self.update_trajectory_line)
+            timed('update_particle_mesh', self.update_particle_mesh)
+            timed('sync_canvas', self.sync_canvas)
+            if not self.world.game_over:
+                timed('update_ui', self.update_ui)
+            timed('flush_hud', self.hud.flush)
+            self.high_scores.maybe_flush()
+
+            if profiler is not None:
+                profiler.end_frame()
+                self.update_profiler_overlay()
+        except Exception as e:
+            print(f"Error in update: {e}")
+            self.world.end_game()
+            self.process_events()
+
+    def toggle_profiler(self):
+        if self.profiler is None:
+            self.profiler = FrameProfiler()
+            self.profiler_label = Label(
+                text="",
+                pos=(Window.width - 440, 20),
+                size_hint=(None, None),
+                font_name='RobotoMono-Regular',
+                font_size=13,
+                color=COLORS['text'],
+                halign='left'
+            )
+            self.profiler_label.bind(texture_size=self.profiler_label.setter('size'))
+            self.add_widget(self.profiler_label)
+            self.profiler_frames = 0
+        else:
+            self.remove_widget(self.profiler_label)
+            delattr(self, 'profiler_label')
+            self.profiler = None
+        # World phases are timed by the same profiler
+        self.world.profiler = self.profiler
+
+    def update_profiler_overlay(self):
+        # Re-rendering the label every frame would show up in its own numbers
+        self.profiler_frames += 1
+        if self.profiler_frames % PROFILER_REFRESH:
+            return
+        world = self.world
+        counts = (f"balls {len(world.balls)}  particles {self.particles.count}  "
+                  f"power-ups {len(world.power_ups)}\n"
+                  f"canvas instructions {count_instructions(self)}  "
+                  f"hud avoided {self.hud.avoided}")
+        events = world.events.stats()
+        counts += f"\nevents raised {events['raised']}  delivered {events['delivered']}"
+        sounds = self.sound_bank.stats()
+        load_times = "  ".join(f"{name} {ms}ms" for name, ms in sounds['load_ms'].items())
+        counts += (f"\nsounds {sounds['loaded']}/{sounds['total']}  merged {sounds['merged']}  "
+                   f"dropped {sounds['dropped']}  {load_times}")
+        counts += f"\n{'pool':<20}{'high':>6}{'capacity':>10}{'allocs':>8}"
+        for name, pool in self.pool_stats().items():
+            counts += (f"\n{name:<20}{pool['high_water']:>6}{pool['capacity']:>10}"
+                       f"{pool.get('allocations', '-'):>8}")
+        self.profiler_label.text = f"{self.profiler.report()}\n{counts}"
+
+    def update_ui(self):
+        world = self.world
+        # Update score and level display
+        self.hud.set('score', world.score)
+        self.hud.set('level', world.level)
+        self.hud.set('missiles', world.missile_number)
+
+        # Update power-up status
+        self.hud.set('power_ups', self.active_power_ups())
+
+    def shutdown(self):
+        # Write anything still pending before the app exits
+        self.high_scores.flush()
+        self.storage.shutdown()
+
+    def save_replay(self):
+        if self.recorder is None:
+            return
+        replay = self.recorder.finish(self.world)
+        self.recorder = None
+        try:
+            os.makedirs(REPLAY_DIR, exist_ok=True)
+            file_name = f"{time.strftime('%Y%m%d-%H%M%S')}-{replay.seed}.cgr"
+            replay.save(os.path.join(REPLAY_DIR, file_name))
+        except OSError as e:
+            print(f"Could not save replay: {e}")
+
+    def end_game(self):
+        self.high_scores.flush()
+        self.save_replay()
+        if 'background' in self.sounds:
+            self.sounds['background'].stop()
+
+        # Clear only game elements, not UI
+        self.clear_game_objects()
+
+        self.game_over_label.text = f'''GAME OVER
+
+Final Score: {self.world.score}
+High Score: {self.world.high_score}
+Level Reached: {self.world.level}
+
+Press Restart to Play Again'''
+        self.show_overlay(self.game_over_overlay, self.game_over_shade, self.game_over_label)
+
+    def reset_game(self, instance=None):
+        # Everything is reset in place; labels, buttons and canvas instructions are reused
+        self.paused = False
+        self.pending_inputs.clear()
+        self.hide_overlay(self.pause_overlay, self.pause_label)
+        self.hide_overlay(self.game_over_overlay, self.game_over_label)
+
+        # Reset help state and hide the help text
+        self.help_clicked = False
+        self.help_label.text = ""
+
+        # Start a fresh simulation, keeping the high score
+        if self.replay is not None:
+            self.world.reset(self.replay.seed)  # Watch the replay again
+            self.world.resize(self.replay.width, self.replay.height)
+            self.replay_step = 0
+        else:
+            self.world.reset()
+            self.recorder = ReplayRecorder(self.world)
+        self.particles.seed(self.world.seed)
+        self.accumulator = 0.0
+
+        # Drop the old game's visuals and show the new one
+        self.clear_game_objects()
+        self.sync_canvas()
+        self.trajectory_line.points = []
+        self.trajectory_points = None
+
+        # Reset UI
+        self.hud.set('high_score', self.world.high_score)
+        self.update_ui()
+        self.hud.flush()
+
+        # Restart music
+        if 'background' in self.sounds:
+            self.sounds['background'].play()
+
+    def clear_game_objects(self):
+        # Hide the shield visual
+        self.shield_overlay.clear()
+
+        # Clear particles
+        self.particles.clear()
+        update_mesh(self.particle_mesh, *self.particles.mesh_data())
+
+        # Drop the shapes of world objects that no longer exist
+        self.draw_batches()
+
+    def _keyboard_closed(self):
+        self._keyboard.unbind(on_key_down=self._on_keyboard_down)
+        self._keyboard = None
+
+    def _on_keyboard_down(self, keyboard, keycode, text, modifiers):
+        if keycode[1] == 'd':
+            self.move_right()
+        elif keycode[1] == 'a':
+            self.move_left()
+        elif keycode[1] == 'left':
+            self.turn_left()
+        elif keycode[1] == 'right':
+            self.turn_right()
+        elif keycode[1] == 'spacebar':
+            self.shoot()
+        elif keycode[1] == 'f3':
+            self.toggle_profiler()
+
+
+
+class CannonApp(App):
+    def __init__(self, replay: Replay = None, **kwargs):
+        super().__init__(**kwargs)
+        self.replay = replay
+
+    def build(self):
+        return CannonGame(replay=self.replay)
+
+    def on_stop(self):
+        self.root.shutdown()
@@ -0,0 +1,45 @@
+class Hud:
+    """Change-tracked label texts, pushed to their labels once per frame
+
+    Each field remembers the value its label currently shows. set() only
+    records the latest value; flush() formats and assigns text for the fields
+    whose value actually changed, so an unchanged score never costs a string
+    format or a label texture re-render.
+    """
+    def __init__(self):
+        self.fields = {}  # name -> [label, formatter, shown value]
+        self.pending = {}
+        self.updates = 0
+        self.avoided = 0
+
+    def add(self, name: str, label, formatter=str, value=None):
+        """
+        Track a label
+        Args:
+            name: Field name used with set()
+            label: Object with a `text` attribute, normally a Kivy Label
+            formatter: Callable turning a value into the label text
+            value: Value the label currently shows, if any
+        """
+        self.fields[name] = [label, formatter, value]
+        self.pending.pop(name, None)
+
+    def set(self, name: str, value):
+        if name in self.pending:
+            self.avoided += 1  # Superseded before it was ever shown
+        self.pending[name] = value
+
+    def flush(self):
+        """Push the pending values that differ from what the labels show"""
+        for name, value in self.pending.items():
+            field = self.fields[name]
+            if field[2] == value:
+                self.avoided += 1
+                continue
+            field[0].text = field[1](value)
+            field[2] = value
+            self.updates += 1
+        self.pending.clear()
+
+    def stats(self) -> dict:
+        return {'updates': self.updates, 'avoided': self.avoided}
@@ -0,0 +1,157 @@
+# Third-party imports
+import numpy as np
+
+# Each particle is drawn as a quad: 4 vertices, 2 triangles
+VERTICES_PER_PARTICLE = 4
+INDICES_PER_PARTICLE = 6
+VERTEX_SIZE = 6  # x, y, r, g, b, a
+MAX_PARTICLES = 65535 // VERTICES_PER_PARTICLE  # Mesh indices are unsigned shorts
+
+
+class ParticleSystem:
+    """Explosion particles stored as contiguous arrays and updated in one pass
+
+    Position, velocity, life and color live in parallel NumPy arrays sized
+    once for a fixed capacity. Live particles always occupy the first `count`
+    slots, so updating, culling and building vertex data are all whole-array
+    operations. Bursts that would overflow the capacity are trimmed, which
+    only costs some eye candy.
+    """
+    def __init__(self, capacity: int = 4096, size: float = 5, decay: float = 0.02, seed: int = None):
+        """
+        Initialize a particle system
+        Args:
+            capacity: Maximum number of live particles
+            size: Width and height of each particle quad in pixels
+            decay: Life lost per update; particles start with a life of 1.0
+            seed: Seed for burst velocities; None picks a fresh one
+        """
+        capacity = min(capacity, MAX_PARTICLES)
+        self.capacity = capacity
+        self.size = size
+        self.decay = decay
+        self.count = 0
+        self.high_water = 0
+        self.dropped = 0
+        self.rng = np.random.default_rng(seed)
+
+        self.pos = np.zeros((capacity, 2), np.float32)
+        self.velocity = np.zeros((capacity, 2), np.float32)
+        self.life = np.zeros(capacity, np.float32)
+        self.color = np.zeros((capacity, 3), np.float32)
+
+        # Vertex buffer and a fixed index pattern, reused every frame
+        self.vertices = np.zeros((capacity, VERTICES_PER_PARTICLE, VERTEX_SIZE), np.float32)
+        quad = np.array([0, 1, 2, 2, 3, 0], np.uint16)
+        offsets = np.arange(capacity, dtype=np.uint16)[:, None] * VERTICES_PER_PARTICLE
+        self.indices = (offsets + quad).ravel()
+
+    def emit(self, pos, color, count: int, spread: float = 2):
+        """
+        Spawn a burst of particles
+        Args:
+            pos: (x, y) origin of the burst
+            color: [r, g, b, ...] color; alpha follows particle life
+            count: Number of particles to spawn
+            spread: Maximum speed along each axis in pixels per update
+        """
+        if self.count + count > self.capacity:
+            self.dropped += self.count + count - self.capacity
+            count = self.capacity - self.count
+        if count <= 0:
+            return
+
+        start, end = self.count, self.count + count
+        self.pos[start:end] = pos
+        self.velocity[start:end] = self.rng.uniform(-spread, spread, (count, 2))
+        self.life[start:end] = 1.0
+        self.color[start:end] = color[:3]
+        self.count = end
+        self.high_water = max(self.high_water, end)
+
+    def explode(self, pos, color, big: bool = False):
+        """Emit an explosion burst; missile blasts are bigger and spread wider"""
+        self.emit(pos, color, 40 if big else 20, spread=4 if big else 2)
+
+    def explode_all(self, pos, color, big):
+        """
+        Emit many explosion bursts in one pass, sized like explode()
+        Args:
+            pos: (n, 2) burst origins
+            color: (n, 4) RGBA colors; alpha follows particle life
+            big: (n,) bools marking missile blasts
+        """
+        counts = np.where(big, 40, 20)
+        total = int(counts.sum())
+        count = min(total, self.capacity - self.count)
+        self.dropped += total - count
+        if count <= 0:
+            return
+
+        start, end = self.count, self.count + count
+        spread = np.repeat(np.where(big, 4, 2), counts)[:count, None]
+        self.pos[start:end] = np.repeat(pos, counts, axis=0)[:count]
+        self.velocity[start:end] = self.rng.uniform(-1, 1, (count, 2)) * spread
+        self.life[start:end] = 1.0
+        self.color[start:end] = np.repeat(color[:, :3], counts, axis=0)[:count]
+        self.count = end
+        self.high_water = max(self.high_water, end)
+
+    def seed(self, seed: int):
+        self.rng = np.random.default_rng(seed)
+
+    def update(self, time_scale: float = 1.0):
+        """
+        Age, cull and move every live particle
+        Args:
+            time_scale: Length of this update relative to the tick decay and velocities are tuned for
+        """
+        n = self.count
+        if not n:
+            return
+        life = self.life[:n]
+        life -= self.decay * time_scale
+
+        # Compact survivors to the front in bulk instead of removing one by one
+        alive = life > 0
+        if not alive.all():
+            n = int(np.count_nonzero(alive))
+            self.pos[:n] = self.pos[:self.count][alive]
+            self.velocity[:n] = self.velocity[:self.count][alive]
+            self.life[:n] = self.life[:self.count][alive]
+            self.color[:n] = self.color[:self.count][alive]
+            self.count = n
+
+        if time_scale == 1.0:
+            self.pos[:n] += self.velocity[:n]
+        else:
+            self.pos[:n] += self.velocity[:n] * time_scale
+
+    def clear(self):
+        self.count = 0
+
+    def stats(self) -> dict:
+        return {
+            'capacity': self.capacity,
+            'in_use': self.count,
+            'high_water': self.high_water,
+            'dropped': self.dropped
+        }
+
+    def mesh_data(self):
+        """Return (vertices, indices) buffers for drawing live particles as quads"""
+        n = self.count
+        vertices = self.vertices[:n]
+        size = self.size
+        x, y = self.pos[:n, 0], self.pos[:n, 1]
+        vertices[:, 0, 0] = x
+        vertices[:, 0, 1] = y
+        vertices[:, 1, 0] = x + size
+        vertices[:, 1, 1] = y
+        vertices[:, 2, 0] = x + size
+        vertices[:, 2, 1] = y + size
+        vertices[:, 3, 0] = x
+        vertices[:, 3, 1] = y + size
+        vertices[:, :, 2:5] = self.color[:n, None, :]
+        vertices[:, :, 5] = self.life[:n, None]
+        return vertices.reshape(-1), self.indices[:n * INDICES_PER_PARTICLE]
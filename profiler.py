@@ -0,0 +1,69 @@
+# Standard library imports
+from collections import deque
+from time import perf_counter
+
+# Frame budget at 60 FPS, in milliseconds
+FRAME_BUDGET_MS = 1000 / 60
+
+
+def call(name, func, *args):
+    """Stand-in for FrameProfiler.measure() when profiling is off"""
+    return func(*args)
+
+
+class FrameProfiler:
+    """Rolling per-phase frame timings
+
+    measure() adds a phase's time to the current frame; a phase that runs
+    several times per frame (one world tick each) is summed. end_frame()
+    files the totals, keeping the last `window` frames per phase for the
+    percentile report.
+    """
+    def __init__(self, window: int = 300):
+        """
+        Initialize a profiler
+        Args:
+            window: Number of recent frames kept per phase
+        """
+        self.window = window
+        self.samples = {}  # phase -> deque of per-frame milliseconds
+        self.current = {}
+        self.frame_start = perf_counter()
+
+    def begin_frame(self):
+        self.current.clear()
+        self.frame_start = perf_counter()
+
+    def measure(self, name: str, func, *args):
+        start = perf_counter()
+        result = func(*args)
+        self.current[name] = self.current.get(name, 0.0) + perf_counter() - start
+        return result
+
+    def end_frame(self):
+        self.current['frame'] = perf_counter() - self.frame_start
+        for name, seconds in self.current.items():
+            samples = self.samples.get(name)
+            if samples is None:
+                samples = self.samples[name] = deque(maxlen=self.window)
+            samples.append(seconds * 1000)
+
+    def reset(self):
+        self.samples.clear()
+        self.current.clear()
+
+    def percentiles(self, name: str) -> tuple[float, float, float]:
+        """p50, p95 and p99 of a phase over the window, in milliseconds"""
+        samples = sorted(self.samples.get(name, ()))
+        if not samples:
+            return 0.0, 0.0, 0.0
+        last = len(samples) - 1
+        return tuple(samples[round(last * q)] for q in (0.5, 0.95, 0.99))
+
+    def report(self) -> str:
+        lines = [f"{'phase':<24}{'p50':>7}{'p95':>7}{'p99':>7}  ms"]
+        for name in self.samples:
+            p50, p95, p99 = self.percentiles(name)
+            flag = '  !' if p99 > FRAME_BUDGET_MS else ''
+            lines.append(f"{name:<24}{p50:>7.2f}{p95:>7.2f}{p99:>7.2f}{flag}")
+        return "\n".join(lines)
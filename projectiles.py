@@ -0,0 +1,33 @@
+# Third-party imports
+import numpy as np
+
+# Game imports
+from arrays import ParallelArrays
+
+# Projectile kinds, stored in Projectiles.kind
+BULLET = 0
+MISSILE = 1
+
+
+class Projectiles(ParallelArrays):
+    """Every shot in flight stored as parallel NumPy arrays, in launch order
+
+    The world moves all live shots, bullets and missiles alike, in one
+    vectorized step and checks them against the balls in one pass. Removal
+    keeps launch order, which decides which of two shots reaching the same
+    ball gets the hit.
+    """
+    COLUMNS = (
+        ('pos', (2,), float),
+        ('velocity', (2,), float),
+        ('kind', (), np.int8),
+        ('age', (), np.int64)  # Ticks in flight
+    )
+
+    def add(self, kind: int, pos, velocity, age: int = 0) -> int:
+        """Launch a shot and return its index"""
+        return self.append(pos, velocity, kind, age)
+
+    def in_flight(self, kind: int) -> int:
+        """Number of live shots of one kind"""
+        return int(np.count_nonzero(self.kind[:self.count] == kind))
@@ -0,0 +1,166 @@
+# Third-party imports
+import numpy as np
+
+# Kivy imports
+from kivy.graphics import Mesh, RenderContext
+
+# Vertex layout shared by batched meshes: x, y, r, g, b, a
+VERTEX_FORMAT = [(b'vPosition', 2, 'float'), (b'vColor', 4, 'float')]
+VERTEX_SIZE = 6
+
+# Kivy's default shader only has a per-instruction color, so batched meshes
+# use this one to carry the color in every vertex instead
+VERTEX_SHADER = '''
+#ifdef GL_ES
+    precision highp float;
+#endif
+
+attribute vec2 vPosition;
+attribute vec4 vColor;
+
+uniform mat4 modelview_mat;
+uniform mat4 projection_mat;
+
+varying vec4 frag_color;
+
+void main(void) {
+    frag_color = vColor;
+    gl_Position = projection_mat * modelview_mat * vec4(vPosition, 0.0, 1.0);
+}
+'''
+
+FRAGMENT_SHADER = '''
+#ifdef GL_ES
+    precision highp float;
+#endif
+
+varying vec4 frag_color;
+
+void main(void) {
+    gl_FragColor = frag_color;
+}
+'''
+
+
+def create_colored_mesh(canvas) -> Mesh:
+    """
+    Add a per-vertex colored triangle mesh to a canvas
+    Args:
+        canvas: Canvas (or instruction group) the mesh is drawn in
+    Returns:
+        The Mesh; assign `vertices` and `indices` buffers to redraw it
+    """
+    context = RenderContext(use_parent_projection=True, use_parent_modelview=True)
+    # Fragment shader first: each assignment relinks against the other stage
+    context.shader.fs = FRAGMENT_SHADER
+    context.shader.vs = VERTEX_SHADER
+    mesh = Mesh(fmt=VERTEX_FORMAT, mode='triangles')
+    context.add(mesh)
+    canvas.add(context)
+    return mesh
+
+
+def update_mesh(mesh: Mesh, vertices, indices):
+    """Upload new vertex and index buffers to a mesh made by create_colored_mesh()"""
+    if not len(indices):
+        # Kivy rejects zero-length buffers, so an empty batch uses plain lists
+        vertices, indices = [], []
+    mesh.vertices = vertices
+    mesh.indices = indices
+
+
+def circle_outline(segments: int):
+    """Points around a circle inscribed in the unit box, for ShapeBatch"""
+    angles = np.linspace(0, 2 * np.pi, segments, endpoint=False)
+    return np.stack([0.5 + 0.5 * np.cos(angles), 0.5 + 0.5 * np.sin(angles)], axis=1)
+
+
+# Corners of the unit box, for ShapeBatch rectangles
+RECT_OUTLINE = np.array([(0, 0), (1, 0), (1, 1), (0, 1)], np.float32)
+
+
+class ShapeBatch:
+    """Every shape of one kind drawn by a single per-vertex colored mesh
+
+    Each shape is a triangle fan around the center of its box, built from
+    an outline in unit-box coordinates. draw() fills a vertex array for all
+    shapes at once from position, size and color arrays, so the canvas
+    holds one mesh however many shapes there are, and drawing costs one
+    vertex upload instead of an instruction walk per shape.
+    """
+    def __init__(self, canvas, outline, capacity: int):
+        """
+        Initialize a shape batch
+        Args:
+            canvas: Canvas the batch's mesh is added to
+            outline: (k, 2) convex outline points in unit-box coordinates
+            capacity: Shapes allocated for up front; grown when exceeded
+        """
+        outline = np.asarray(outline, np.float32)
+        # Fan center first, then the outline
+        self.template = np.concatenate([[(0.5, 0.5)], outline]).astype(np.float32)
+        self.vertices_per_shape = len(self.template)
+        self.max_shapes = 65535 // self.vertices_per_shape  # Mesh indices are unsigned shorts
+        self.mesh = create_colored_mesh(canvas)
+        self.visible = 0
+        self.high_water = 0
+        self.allocations = 0
+        self.capacity = min(capacity, self.max_shapes)
+        self.allocate(self.capacity)
+
+    def allocate(self, capacity: int):
+        k = self.vertices_per_shape
+        self.vertices = np.zeros((capacity, k, VERTEX_SIZE), np.float32)
+        fan = np.stack([np.zeros(k - 1), np.arange(1, k), np.roll(np.arange(1, k), -1)], axis=1)
+        offsets = np.arange(capacity)[:, None, None] * k
+        self.indices = (offsets + fan).astype(np.uint16).ravel()
+
+    def draw(self, pos, size, color):
+        """
+        Rebuild the mesh from arrays describing every shape
+        Args:
+            pos: (n, 2) lower-left corners
+            size: (width, height) shared by all shapes, or an (n, 2) array
+            color: (n, 4) RGBA colors
+        """
+        n = min(len(pos), self.max_shapes)
+        self.visible = n
+        self.high_water = max(self.high_water, n)
+        if not n:
+            update_mesh(self.mesh, (), ())
+            return
+        if n > len(self.vertices):
+            self.allocations += n - len(self.vertices)
+            self.allocate(min(max(n, 2 * len(self.vertices)), self.max_shapes))
+
+        vertices = self.vertices[:n]
+        size = np.asarray(size, np.float32)
+        if size.ndim == 2:
+            size = size[:n, None, :]
+        vertices[:, :, 0:2] = np.asarray(pos, np.float32)[:n, None, :] + self.template * size
+        vertices[:, :, 2:6] = np.asarray(color, np.float32)[:n, None, :]
+        fan_indices = 3 * (self.vertices_per_shape - 1)
+        update_mesh(self.mesh, vertices.reshape(-1), self.indices[:n * fan_indices])
+
+    def stats(self) -> dict:
+        return {
+            'capacity': self.capacity,
+            'in_use': self.visible,
+            'high_water': self.high_water,
+            'allocations': self.allocations
+        }
+
+
+def count_instructions(widget) -> int:
+    """Number of graphics instructions drawn for a widget and its children"""
+    def count(group) -> int:
+        total = 0
+        for instruction in group.children:
+            total += 1
+            if hasattr(instruction, 'children'):
+                total += count(instruction)
+        return total
+
+    # canvas.before, canvas.after and every child widget's canvas are groups
+    # inside the canvas; reading the before/after properties would create them
+    return count(widget.canvas)
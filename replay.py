@@ -0,0 +1,242 @@
+# Standard library imports
+import argparse
+import sys
+import time
+import zlib
+
+# Game imports
+from simulation import (
+    AIM, FIRE, MOVE_LEFT, MOVE_RIGHT, RESIZE, SWITCH, TURN_LEFT, TURN_RIGHT, World
+)
+
+# File layout: MAGIC followed by a zlib-compressed stream of varints
+#   header:  version, seed (zigzag), tick_rate, width, height
+#   records: (step delta << 3 | action code) + 1, then the action's arguments
+#   footer:  END, steps, final score, final level
+MAGIC = b'CGRP'
+# 2: auto aim power-ups spawn; 3: rapid fire power-ups spawn; 4: speed boosts the next shot;
+# 5: seed is zigzag encoded so negative seeds round-trip
+VERSION = 5
+ACTION_CODES = {
+    AIM: 0,
+    FIRE: 1,
+    SWITCH: 2,
+    MOVE_LEFT: 3,
+    MOVE_RIGHT: 4,
+    TURN_LEFT: 5,
+    TURN_RIGHT: 6,
+    RESIZE: 7
+}
+ACTIONS = {code: action for action, code in ACTION_CODES.items()}
+END = 0  # Records are offset by one so they never collide with this marker
+
+
+def write_varint(out: bytearray, value: int):
+    if value < 0:
+        raise ValueError(f"Varints are unsigned; zigzag {value} first")
+    while value >= 0x80:
+        out.append((value & 0x7F) | 0x80)
+        value >>= 7
+    out.append(value)
+
+
+def read_varint(data: bytes, offset: int) -> tuple[int, int]:
+    value = shift = 0
+    while True:
+        byte = data[offset]
+        offset += 1
+        value |= (byte & 0x7F) << shift
+        if byte < 0x80:
+            return value, offset
+        shift += 7
+
+
+def zigzag(value: int) -> int:
+    return value * 2 if value >= 0 else -value * 2 - 1
+
+
+def unzigzag(value: int) -> int:
+    return value >> 1 if not value & 1 else -(value >> 1) - 1
+
+
+class Replay:
+    """A recorded game: the world's seed and settings plus every input, by step"""
+    def __init__(self, seed: int, tick_rate: int, width: int, height: int):
+        """
+        Initialize a replay
+        Args:
+            seed: Seed the recorded game started from
+            tick_rate: Simulation steps per second of the recorded game
+            width: Playfield width at the start of the game
+            height: Playfield height at the start of the game
+        """
+        self.seed = seed
+        self.tick_rate = tick_rate
+        self.width = width
+        self.height = height
+        self.inputs = {}  # step index -> [(action, value), ...]
+        self.steps = 0
+        self.score = None
+        self.level = None
+
+    def to_bytes(self) -> bytes:
+        out = bytearray()
+        for value in (VERSION, zigzag(self.seed), self.tick_rate, self.width, self.height):
+            write_varint(out, value)
+
+        last_step = 0
+        aim_x = aim_y = 0
+        for step in sorted(self.inputs):
+            for action, value in self.inputs[step]:
+                write_varint(out, ((step - last_step) << 3 | ACTION_CODES[action]) + 1)
+                last_step = step
+                if action == AIM:
+                    # Aim points move a little between events; store the difference
+                    write_varint(out, zigzag(value[0] - aim_x))
+                    write_varint(out, zigzag(value[1] - aim_y))
+                    aim_x, aim_y = value
+                elif action == RESIZE:
+                    write_varint(out, value[0])
+                    write_varint(out, value[1])
+
+        write_varint(out, END)
+        for value in (self.steps, self.score or 0, self.level or 0):
+            write_varint(out, value)
+        return MAGIC + zlib.compress(bytes(out), 9)
+
+    @classmethod
+    def from_bytes(cls, data: bytes) -> 'Replay':
+        if data[:len(MAGIC)] != MAGIC:
+            raise ValueError("Not a replay file")
+        data = zlib.decompress(data[len(MAGIC):])
+
+        offset = 0
+        header = []
+        for _ in range(5):
+            value, offset = read_varint(data, offset)
+            header.append(value)
+        version, seed, tick_rate, width, height = header
+        if version != VERSION:
+            raise ValueError(f"Unsupported replay version {version}")
+        replay = cls(unzigzag(seed), tick_rate, width, height)
+
+        step = 0
+        aim_x = aim_y = 0
+        while True:
+            record, offset = read_varint(data, offset)
+            if record == END:
+                break
+            record -= 1
+            step += record >> 3
+            action = ACTIONS[record & 0x7]
+            value = None
+            if action == AIM:
+                dx, offset = read_varint(data, offset)
+                dy, offset = read_varint(data, offset)
+                aim_x += unzigzag(dx)
+                aim_y += unzigzag(dy)
+                value = (aim_x, aim_y)
+            elif action == RESIZE:
+                width, offset = read_varint(data, offset)
+                height, offset = read_varint(data, offset)
+                value = (width, height)
+            replay.inputs.setdefault(step, []).append((action, value))
+
+        replay.steps, offset = read_varint(data, offset)
+        replay.score, offset = read_varint(data, offset)
+        replay.level, offset = read_varint(data, offset)
+        return replay
+
+    def save(self, path: str):
+        with open(path, 'wb') as f:
+            f.write(self.to_bytes())
+
+    @classmethod
+    def load(cls, path: str) -> 'Replay':
+        with open(path, 'rb') as f:
+            return cls.from_bytes(f.read())
+
+    def create_world(self) -> World:
+        return World(self.width, self.height, seed=self.seed, tick_rate=self.tick_rate)
+
+
+class ReplayRecorder:
+    """Collects the inputs of a live game, one world step at a time"""
+    def __init__(self, world: World):
+        self.replay = Replay(world.seed, world.tick_rate, int(world.width), int(world.height))
+
+    def record(self, inputs):
+        """Record the inputs for the next world step; call once per step"""
+        replay = self.replay
+        if inputs:
+            recorded = []
+            for action, value in inputs:
+                # Repeated aims within a step only matter for the last one
+                if action == AIM and recorded and recorded[-1][0] == AIM:
+                    recorded[-1] = (action, value)
+                else:
+                    recorded.append((action, value))
+            replay.inputs[replay.steps] = recorded
+        replay.steps += 1
+
+    def finish(self, world: World) -> Replay:
+        self.replay.score = world.score
+        self.replay.level = world.level
+        return self.replay
+
+
+def play(replay: Replay, realtime: bool = False) -> World:
+    """
+    Re-run a replay without rendering
+    Args:
+        replay: Replay to run
+        realtime: Pace the steps at the recorded tick rate instead of running flat out
+    Returns:
+        The world in its final state
+    """
+    world = replay.create_world()
+    tick = 1 / replay.tick_rate
+    start = time.perf_counter()
+    for step in range(replay.steps):
+        world.step(replay.inputs.get(step, ()))
+        world.events.clear()  # Nothing renders them
+        if realtime:
+            delay = start + (step + 1) * tick - time.perf_counter()
+            if delay > 0:
+                time.sleep(delay)
+    return world
+
+
+def verify(replay: Replay) -> bool:
+    """Check that a replay reproduces its recorded final score and level"""
+    world = play(replay)
+    return world.score == replay.score and world.level == replay.level
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Inspect, verify or play back Cannon Game replays")
+    parser.add_argument('command', choices=['info', 'verify', 'play'])
+    parser.add_argument('path', help="Replay file")
+    parser.add_argument('--realtime', action='store_true', help="Play back at 1x speed")
+    args = parser.parse_args(argv)
+
+    replay = Replay.load(args.path)
+    events = sum(len(inputs) for inputs in replay.inputs.values())
+    print(f"seed {replay.seed}, {replay.steps} steps at {replay.tick_rate} Hz "
+          f"({replay.steps / replay.tick_rate:.0f}s), {events} inputs")
+    print(f"recorded: score {replay.score}, level {replay.level}")
+    if args.command == 'info':
+        return 0
+
+    start = time.perf_counter()
+    world = play(replay, realtime=args.realtime)
+    elapsed = time.perf_counter() - start
+    print(f"replayed: score {world.score}, level {world.level} in {elapsed:.3f}s")
+    if world.score != replay.score or world.level != replay.level:
+        print("MISMATCH: replay does not reproduce the recorded game")
+        return 1
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
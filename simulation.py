@@ -0,0 +1,889 @@
+# Standard library imports
+import math
+import random
+from functools import partial
+from math import atan2, cos, degrees, radians, sin
+
+# Third-party imports
+import numpy as np
+
+# Game imports
+from aim import AIM_HORIZON, ball_paths, solve_intercepts
+from enemies import EnemyArray
+from events import EventQueue
+from pool import Pool
+from profiler import call
+from projectiles import BULLET, MISSILE, Projectiles
+from spatial import SpatialHash
+from timers import TimerWheel
+
+# Game Constants
+WINDOW_WIDTH = 900
+WINDOW_HEIGHT = 700  # Adjusted height for better UI placement
+BULLET_SPEED = 60  # Increased bullet speed
+MISSILE_SPEED = 30
+GRAVITY = 1
+MISSILE_GRAVITY = 0.1
+POWER_UP_CHANCE = 0.01  # Reduced from 0.01 for better balance
+
+# Pre-allocated object counts; the difficulty curve caps balls on screen at 15
+BALL_POOL_SIZE = 32
+POWER_UP_POOL_SIZE = 16
+PROJECTILE_CAPACITY = 32
+
+BALL_SIZE = (40, 40)
+BLOCK_SIZE = (30, 15)
+BULLET_SIZE = (15, 35)
+MISSILE_SIZE = (10, 35)
+
+# Broad-phase grid cell for power-up pickups; shots use the vectorized overlap test
+COLLISION_CELL_SIZE = 64
+
+# Simulation timing
+BASE_TICK_RATE = 60  # Per-tick speeds and chances above are tuned for this rate
+TICK_RATE = 60  # Default simulation steps per second of game time
+GRACE_PERIOD = 2.0  # Seconds without enemies at the start of a game
+COMBO_WINDOW = 2.0  # Seconds allowed between hits to keep a combo going
+MISSILE_POINTS = 3  # Shared between every ball a missile blast hits
+HIT_COLOR = [0.5, 0.5, 1, 1]  # Explosion color of a destroyed ball
+RAPID_FIRE_INTERVAL = 0.1  # Seconds to reload a bullet during rapid fire
+
+# Modern Color Scheme with Neon Dark Theme
+COLORS = {
+    'primary': [0, 1, 0.8, 1],        # Neon Cyan
+    'secondary': [0.2, 0.8, 1, 1],    # Bright Blue
+    'accent': [1, 0.2, 0.4, 0.9],     # Neon Pink
+    'success': [0.4, 1, 0.4, 1],      # Neon Green
+    'warning': [1, 0.8, 0, 1],        # Neon Yellow
+    'background': [0.06, 0.06, 0.08, 1], # Dark Background
+    'text': [0.9, 0.9, 1, 1],         # Light Text
+    'block_glow': [1, 0.2, 0.4, 0.3]  # Pink glow for blocks
+}
+
+# Player input actions, queued as (action, value) pairs and applied by World.step()
+AIM = 'aim'                # value: (x, y) point to aim the cannon at
+TURN_LEFT = 'turn_left'
+TURN_RIGHT = 'turn_right'
+MOVE_LEFT = 'move_left'
+MOVE_RIGHT = 'move_right'
+FIRE = 'fire'
+SWITCH = 'switch'
+RESIZE = 'resize'          # value: (width, height) of the playfield
+
+
+class GameObject:
+    """Base class for all game objects with position, size and visual representation"""
+    def __init__(self, pos: tuple[float, float], size: tuple[float, float], color: list[float]):
+        """
+        Initialize a game object
+        Args:
+            pos: (x, y) position tuple
+            size: (width, height) size tuple
+            color: [r, g, b, a] color list
+        """
+        self.pos = list(pos)
+        self.size = size
+        self.color = color
+        self.shape = None
+
+
+class PowerUp(GameObject):
+    """Power-up object that provides special abilities when collected"""
+    def __init__(self, pos: tuple[float, float], power_type: str):
+        """
+        Initialize a power-up
+        Args:
+            pos: (x, y) position tuple
+            power_type: Type of power-up (speed, shield, double_score, auto_aim, rapid_fire)
+        """
+        super().__init__(pos, (30, 30), COLORS['primary'])
+        self.activate(pos, power_type)
+
+    def activate(self, pos: tuple[float, float], power_type: str):
+        """Place the power-up and set its type; used again when reusing a pooled power-up"""
+        self.pos[0], self.pos[1] = pos
+        self.color = {
+            'speed': COLORS['success'],
+            'shield': [0, 1, 1, 1],
+            'double_score': COLORS['warning'],
+            'auto_aim': [1, 0.4, 1, 1],
+            'rapid_fire': [1, 0.5, 0, 1]
+        }.get(power_type, COLORS['primary'])
+        self.type = power_type
+        self.active = True
+
+class Particle(GameObject):
+    """Particle effect for explosions and visual effects"""
+    def __init__(self, pos: tuple[float, float], color: list[float], rng: random.Random = None):
+        """
+        Initialize a particle
+        Args:
+            pos: (x, y) position tuple
+            color: [r, g, b, a] color list
+            rng: Random generator for the velocity (the world's, for reproducible runs)
+        """
+        super().__init__(pos, (5, 5), color)
+        rng = rng or random
+        self.life: float = 1.0  # Time until particle disappears
+        self.velocity: list[float] = [rng.uniform(-2, 2), rng.uniform(-2, 2)]  # Movement direction and speed
+
+
+class DifficultyParams:
+    """The tunable constants of the difficulty curve
+
+    The defaults are the hand-tuned game. Every value is a keyword
+    argument, so balancing tools can build variants with replace() and
+    play them headless.
+    """
+    FIELDS = ('initial_balls', 'ball_increment', 'ball_decay', 'spawn_base', 'spawn_increment',
+              'initial_speed', 'speed_increment', 'speed_decay', 'movement_intensity',
+              'points_per_level', 'power_up_scaling')
+
+    def __init__(self, initial_balls: float = 5.0, ball_increment: float = 1.0, ball_decay: float = 0.1,
+                 spawn_base: float = 0.01, spawn_increment: float = 0.002, initial_speed: float = 0.3,
+                 speed_increment: float = 0.02, speed_decay: float = 0.05, movement_intensity: float = 0.1,
+                 points_per_level: int = 15, power_up_scaling: float = 1.0):
+        """
+        Initialize a difficulty curve
+        Args:
+            initial_balls, ball_increment, ball_decay: Balls allowed on screen,
+                initial_balls + level * ball_increment / (1 + level * ball_decay)
+            spawn_base, spawn_increment: Spawn chance per tuned tick,
+                spawn_base + level * spawn_increment
+            initial_speed, speed_increment, speed_decay: Fall speed,
+                initial_speed + level * speed_increment / (1 + level * speed_decay)
+            movement_intensity: Sideways sway added per level
+            points_per_level: Score needed for each new level
+            power_up_scaling: Weight of the log2(level) bonus on power-up durations
+        """
+        self.initial_balls = initial_balls
+        self.ball_increment = ball_increment
+        self.ball_decay = ball_decay
+        self.spawn_base = spawn_base
+        self.spawn_increment = spawn_increment
+        self.initial_speed = initial_speed
+        self.speed_increment = speed_increment
+        self.speed_decay = speed_decay
+        self.movement_intensity = movement_intensity
+        self.points_per_level = points_per_level
+        self.power_up_scaling = power_up_scaling
+
+    def replace(self, **changes) -> 'DifficultyParams':
+        """A copy with some values changed"""
+        return DifficultyParams(**{**self.to_dict(), **changes})
+
+    def to_dict(self) -> dict:
+        return {name: getattr(self, name) for name in self.FIELDS}
+
+
+class World:
+    """Headless game simulation that owns every rule of the cannon game
+
+    The world knows nothing about Kivy. A front-end feeds it player input
+    through step() and reads back positions, score and the merged events
+    (sounds, explosions, game over) to render a frame.
+
+    Every tick advances a fixed amount of game time and all randomness comes
+    from one seeded generator, so the same seed and the same per-tick inputs
+    always replay to the same game, whatever the display frame rate.
+    """
+    def __init__(self, width: float = WINDOW_WIDTH, height: float = WINDOW_HEIGHT, high_score: int = 0,
+                 seed: int = None, tick_rate: int = TICK_RATE, difficulty: DifficultyParams = None):
+        """
+        Initialize a world
+        Args:
+            width: Playfield width in pixels
+            height: Playfield height in pixels
+            high_score: Best score recorded so far
+            seed: Seed for the game's random generator; None picks a fresh one
+            tick_rate: Simulation steps per second of game time
+            difficulty: Difficulty curve; None uses the tuned defaults
+        """
+        self.difficulty = difficulty or DifficultyParams()
+        self.width = width
+        self.height = height
+        self.high_score = high_score
+        self.tick_rate = tick_rate
+        self.time_scale = BASE_TICK_RATE / tick_rate  # Fraction of a tuned tick per step
+        self.rng = random.Random()
+
+        # Enemies live in arrays moved in one vectorized step; power-ups are
+        # recycled between spawns and games
+        self.balls = EnemyArray(BALL_SIZE, BALL_POOL_SIZE)
+        self.blocks = EnemyArray(BLOCK_SIZE, 0)
+        self.power_up_pool = Pool(lambda: PowerUp((0, 0), 'speed'), POWER_UP_POOL_SIZE)
+        self.power_ups = []
+
+        # Every bullet and missile in flight
+        self.projectiles = Projectiles(PROJECTILE_CAPACITY)
+
+        # Broad-phase index, rebuilt each tick before pickup queries
+        self.power_up_grid = SpatialHash(COLLISION_CELL_SIZE)
+
+        # Grace period, combo and power-up timers, in game ticks
+        self.timers = TimerWheel()
+
+        # Sounds, explosions and flags raised by the rules, merged until drained
+        self.events = EventQueue()
+
+        # Optional FrameProfiler timing the phases of step()
+        self.profiler = None
+        self.reset(seed)
+
+    def reset(self, seed: int = None):
+        """
+        Start a new game, keeping the playfield size and the high score
+        Args:
+            seed: Seed for the new game; None picks a fresh one
+        """
+        if seed is None:
+            seed = random.SystemRandom().getrandbits(32)
+        self.seed = seed
+        self.rng.seed(seed)
+        self.tick = 0
+        self.events.clear()
+        self.timers.clear()
+
+        # Grace period
+        self.grace_period = True
+        self.schedule('grace_period', GRACE_PERIOD, self.end_grace_period)
+
+        # Initialize destroyed balls counter
+        self.destroyed_balls = 0
+
+        # Game state
+        self.score = 0
+        self.level = 1
+        self.update_difficulty()
+        self.game_over = False
+        self.combo = 0
+
+        # Weapon state
+        self.bullet_state = 'ready'
+        self.missile_state = 'not ready'
+        self.missile_number = 3
+        self.bullet_speed = BULLET_SPEED
+        self.missile_speed = MISSILE_SPEED
+        self.bullet_heading = 90
+        self.missile_heading = 90
+
+        # Movement and position
+        self.x = 0
+        self.cannon_base = GameObject((0, 30), (50, 20), COLORS['primary'])
+        self.cannon = GameObject((0, 40), (20, 40), COLORS['secondary'])
+        self.place_cannon()
+        self.bullet = GameObject((self.cannon.pos[0] + 5, 70), BULLET_SIZE, COLORS['accent'])
+        self.missile = GameObject((self.cannon.pos[0] + 5, 70), MISSILE_SIZE, COLORS['success'])
+        self.update_bullet_velocity()
+        self.update_missile_velocity()
+
+        # Power-ups and special features
+        self.power_up_types = ['speed', 'shield', 'double_score', 'auto_aim', 'rapid_fire']
+        self.has_shield = False
+        self.score_multiplier = 1
+        self.bullet_speed_boost = 1
+        self.auto_aim = False
+        self.rapid_fire = False
+
+        # Game objects
+        self.clear_game_objects()
+
+    @property
+    def time(self) -> float:
+        """Elapsed game time in seconds"""
+        return self.tick / self.tick_rate
+
+    def resize(self, width: float, height: float):
+        self.width = width
+        self.height = height
+        self.place_cannon()
+
+    def place_cannon(self):
+        self.cannon_base.pos = [self.width / 2 + self.x, 30]
+        self.cannon.pos = [self.width / 2 + self.x + 15, 40]
+
+    def drain_events(self) -> list:
+        """Return and clear the events emitted since the last call, merged by EventQueue.drain()"""
+        return self.events.drain()
+
+    def step(self, inputs=()):
+        """
+        Advance the game by one tick
+        Args:
+            inputs: Sequence of (action, value) pairs to apply before moving
+        """
+        if self.game_over:
+            return
+
+        self.timers.advance(self.tick)
+        for action, value in inputs:
+            self.apply_input(action, value)
+            if self.game_over:
+                return
+
+        timed = self.profiler.measure if self.profiler is not None else call
+        if self.auto_aim:
+            timed('auto_aim', self.update_auto_aim)
+        timed('update_power_ups', self.update_power_ups)
+        timed('update_projectiles', self.update_projectiles)
+        if not self.grace_period:
+            timed('spawn_enemies', self.spawn_enemies)
+        timed('update_enemies', self.update_enemies)
+        if not self.game_over:
+            timed('check_collisions', self.check_collisions)
+        self.tick += 1
+
+    def schedule(self, key, seconds: float, callback):
+        """Run callback() after `seconds` of game time, replacing any timer with the same key"""
+        self.timers.schedule(key, math.ceil(seconds * self.tick_rate - 1e-9), callback)
+
+    def time_remaining(self, key) -> float:
+        """Game seconds until a pending timer fires, or None"""
+        ticks = self.timers.remaining(key)
+        return None if ticks is None else ticks / self.tick_rate
+
+    def end_grace_period(self):
+        self.grace_period = False
+        self.timers.cancel('grace_period')
+
+    def apply_input(self, action, value=None):
+        if action == AIM:
+            self.aim_at(value)
+        elif action == FIRE:
+            self.shoot()
+        elif action == SWITCH:
+            self.switch_bullet_missile()
+        elif action == MOVE_LEFT:
+            self.move_left()
+        elif action == MOVE_RIGHT:
+            self.move_right()
+        elif action == TURN_LEFT:
+            self.turn_left()
+        elif action == TURN_RIGHT:
+            self.turn_right()
+        elif action == RESIZE:
+            self.resize(*value)
+
+    def create_explosion(self, pos, color):
+        # Bigger explosion radius for missile
+        self.events.explosion(tuple(pos), color, self.missile_state == 'fire')
+
+    def play_sound(self, sound_name):
+        self.events.sound(sound_name)
+
+    def shoot(self):
+        if self.auto_aim:
+            self.update_auto_aim()  # Aim at where the balls are now, not a tick ago
+        # The loaded round launches as a new projectile; the cannon reloads when
+        # its shots are gone, or after a short delay during rapid fire
+        if self.bullet_state == 'ready':
+            self.play_sound('bullet')
+            self.projectiles.add(BULLET, self.bullet.pos, (self.bullet_dx, self.bullet_dy))
+            self.bullet_state = 'fire'
+            if self.rapid_fire:
+                self.schedule('reload', RAPID_FIRE_INTERVAL, self.reset_bullet)
+        elif self.missile_state == 'ready' and self.missile_number > 0:
+            self.play_sound('missile')
+            self.projectiles.add(MISSILE, self.missile.pos, (self.missile_dx, self.missile_dy))
+            self.missile_state = 'fire'
+            self.missile_number -= 1
+
+    def move_right(self):
+        target_x = self.x + 30
+        if self.width / 2 + target_x < self.width - 50:  # Boundary check
+            self.x = target_x
+            self.place_cannon()
+            if self.bullet_state == 'ready':
+                self.bullet.pos = [self.cannon.pos[0] + 5, 70]
+            if self.missile_state == 'ready':
+                self.missile.pos = [self.cannon.pos[0] + 5, 70]
+
+    def move_left(self):
+        target_x = self.x - 30
+        if self.width / 2 + target_x > 0:  # Boundary check
+            self.x = target_x
+            self.place_cannon()
+            if self.bullet_state == 'ready':
+                self.bullet.pos = [self.cannon.pos[0] + 5, 70]
+            if self.missile_state == 'ready':
+                self.missile.pos = [self.cannon.pos[0] + 5, 70]
+
+    def turn_left(self):
+        if self.bullet_state == 'ready':
+            self.bullet_heading += 10
+            self.update_bullet_velocity()
+        elif self.missile_state == 'ready':
+            self.missile_heading += 10
+            self.update_missile_velocity()
+
+    def turn_right(self):
+        if self.bullet_state == 'ready':
+            self.bullet_heading -= 10
+            self.update_bullet_velocity()
+        elif self.missile_state == 'ready':
+            self.missile_heading -= 10
+            self.update_missile_velocity()
+
+    def aim_at(self, pos):
+        # Update cannon rotation based on mouse position
+        dx = pos[0] - (self.cannon.pos[0] + self.cannon.size[0]/2)
+        dy = pos[1] - (self.cannon.pos[1] + self.cannon.size[1]/2)
+        angle = degrees(atan2(dy, dx))
+
+        if self.bullet_state == 'ready':
+            self.bullet_heading = angle
+            self.update_bullet_velocity()
+        elif self.missile_state == 'ready':
+            self.missile_heading = angle
+            self.update_missile_velocity()
+
+    def switch_bullet_missile(self):
+        if self.bullet_state == 'ready':
+            self.bullet_state = 'not ready'
+            self.missile_state = 'ready'
+        elif self.missile_state == 'ready':
+            self.bullet_state = 'ready'
+            self.missile_state = 'not ready'
+
+    def update_bullet_velocity(self):
+        self.bullet_dx = self.bullet_speed * cos(radians(self.bullet_heading))
+        self.bullet_dy = self.bullet_speed * sin(radians(self.bullet_heading))
+
+    def update_missile_velocity(self):
+        self.missile_dx = self.missile_speed * cos(radians(self.missile_heading))
+        self.missile_dy = self.missile_speed * sin(radians(self.missile_heading))
+
+    def update_auto_aim(self):
+        """Turn a ready bullet toward the lowest ball it can hit, solving every ball at once"""
+        balls = self.balls
+        if self.bullet_state != 'ready' or not balls.count:
+            return
+        pos = balls.pos[:balls.count]
+        steps = math.ceil(AIM_HORIZON * self.tick_rate)
+        if self.grace_period:
+            x, y = ball_paths(pos, steps, 0, 0)  # Balls hold still until the grace period ends
+        else:
+            x, y = ball_paths(pos, steps, self.ball_speed, self.ball_sway)
+        headings, _ = solve_intercepts(self.bullet.pos, self.bullet_speed, GRAVITY, x, y, balls.size,
+                                       self.bullet.size, (self.width, self.height), self.time_scale)
+
+        # The lowest ball is the one about to get through; without a solution keep the player's aim
+        hittable = np.flatnonzero(~np.isnan(headings))
+        if hittable.size:
+            target = hittable[np.argmin(pos[hittable, 1])]
+            self.bullet_heading = float(headings[target])
+            self.update_bullet_velocity()
+
+    def apply_power_up(self, power_up):
+        # Calculate duration based on level using logarithmic scaling
+        base_durations = {
+            'speed': 10,
+            'shield': 15,
+            'double_score': 20,
+            'auto_aim': 8,
+            'rapid_fire': 8
+        }
+        duration = base_durations[power_up.type] * (1 + self.difficulty.power_up_scaling * math.log2(self.level))
+        self.activate_power_up(power_up.type, duration)
+        self.create_explosion(power_up.pos, power_up.color)
+
+    def activate_power_up(self, power_type, duration):
+        if power_type == 'speed':
+            self.bullet_speed_boost = 2
+            self.bullet_speed = BULLET_SPEED * 2
+            self.update_bullet_velocity()  # The next shot flies the arc the preview shows
+        elif power_type == 'shield':
+            self.has_shield = True
+        elif power_type == 'double_score':
+            self.score_multiplier = 2
+        elif power_type == 'auto_aim':
+            self.auto_aim = True
+        elif power_type == 'rapid_fire':
+            self.rapid_fire = True
+        # A new pickup of the same type replaces the old timer instead of racing it
+        self.schedule(power_type, duration, partial(self.reset_power_up, power_type))
+        self.events.flag('power_up_status')
+
+    def reset_power_up(self, power_type):
+        if power_type == 'speed':
+            self.bullet_speed_boost = 1
+            self.bullet_speed = BULLET_SPEED
+            self.update_bullet_velocity()
+        elif power_type == 'shield':
+            self.has_shield = False
+        elif power_type == 'double_score':
+            self.score_multiplier = 1
+        elif power_type == 'auto_aim':
+            self.auto_aim = False
+        elif power_type == 'rapid_fire':
+            self.rapid_fire = False
+        self.events.flag('power_up_status')
+
+    def update_projectiles(self):
+        shots = self.projectiles
+        n = shots.count
+        if not n:
+            return
+        k = self.time_scale
+        pos, velocity = shots.pos[:n], shots.velocity[:n]
+        missile = shots.kind[:n] == MISSILE
+        pos += velocity * k
+        velocity[:, 1] -= np.where(missile, MISSILE_GRAVITY, GRAVITY) * k
+        shots.age[:n] += 1
+
+        # Missiles bounce off the walls and the ceiling
+        if missile.any():
+            max_x = self.width - self.missile.size[0]
+            max_y = self.height - self.missile.size[1]
+            left = missile & (pos[:, 0] < 0)
+            right = missile & (pos[:, 0] > max_x)
+            top = missile & (pos[:, 1] > max_y)
+            pos[left, 0] = 0
+            velocity[left, 0] = np.abs(velocity[left, 0])  # Bounce right
+            pos[right, 0] = max_x
+            velocity[right, 0] = -np.abs(velocity[right, 0])  # Bounce left
+            pos[top, 1] = max_y
+            velocity[top, 1] = -np.abs(velocity[top, 1])  # Bounce down
+
+        # Bullets are gone past any edge, missiles only past the bottom
+        gone = pos[:, 1] < 0
+        gone |= ~missile & ((pos[:, 0] < 0) | (pos[:, 0] > self.width) | (pos[:, 1] > self.height))
+        if gone.any():
+            shots.keep(~gone)
+            self.reload_weapons()
+
+    def reload_weapons(self):
+        """Load a fired weapon again once none of its shots are left in flight"""
+        if self.bullet_state == 'fire' and not self.projectiles.in_flight(BULLET):
+            self.reset_bullet()
+        if self.missile_state == 'fire' and not self.projectiles.in_flight(MISSILE):
+            self.reset_missile()
+
+    def update_difficulty(self):
+        """Derive spawn and movement parameters from the level; call when it changes"""
+        level = self.level
+        time_scale = self.time_scale
+        params = self.difficulty
+
+        # Diminishing returns formula: base + (level * increment) / (1 + level * decay)
+        self.max_balls = params.initial_balls + (level * params.ball_increment) / (1 + level * params.ball_decay)
+        spawn_chance = params.spawn_base + (level * params.spawn_increment)
+        self.spawn_chance = spawn_chance * time_scale
+
+        # Balls get more vibrant colors at higher levels
+        self.color_intensity = min(0.5 + (level * 0.03), 1.0)  # Reduced color intensity change
+
+        # Diminishing returns formula for speed
+        base_speed = params.initial_speed + (level * params.speed_increment) / (1 + level * params.speed_decay)
+        self.ball_speed = base_speed * time_scale
+
+        # More complex movement patterns at higher levels
+        movement_intensity = 1 + (level * params.movement_intensity)
+        self.ball_sway = 2 * movement_intensity * time_scale
+
+        self.block_speed = (0.5 + level * 0.05) * time_scale
+
+    def spawn_enemies(self):
+        rng = self.rng
+        if len(self.balls) < self.max_balls and rng.random() < self.spawn_chance:
+            pos = (rng.randint(100, self.width - 100), self.height)
+            color_intensity = self.color_intensity
+            color = [
+                rng.uniform(color_intensity, 1),
+                rng.uniform(color_intensity, 1),
+                rng.uniform(color_intensity, 1),
+                1
+            ]
+            self.balls.add(pos, color)
+
+    def update_power_ups(self):
+        # Spawn power-ups with controlled randomness
+        rng = self.rng
+        if rng.random() < POWER_UP_CHANCE * self.time_scale:
+            power_type = rng.choice(['speed', 'shield', 'double_score', 'auto_aim', 'rapid_fire'])
+            pos = (rng.randint(50, self.width-50), self.height)
+            power_up = self.power_up_pool.acquire()
+            power_up.activate(pos, power_type)
+            self.power_ups.append(power_up)
+
+        # Update existing power-ups
+        for power_up in self.power_ups[:]:
+            power_up.pos[1] -= 3 * self.time_scale  # Slightly faster fall speed
+
+            if power_up.pos[1] < 0:
+                self.remove_power_up(power_up)
+
+        # Collect every power-up touching the cannon
+        if self.power_ups:
+            self.power_up_grid.rebuild(self.power_ups)
+            for power_up in self.power_up_grid.query_box(*self.cannon.pos, *self.cannon.size):
+                self.apply_power_up(power_up)
+                self.remove_power_up(power_up)
+
+    def update_level(self):
+        old_level = self.level
+        new_level = self.score // self.difficulty.points_per_level + 1
+
+        if new_level > old_level:
+            self.level = new_level
+            self.update_difficulty()
+            self.play_sound('level_up')
+
+    def reset_bullet(self):
+        self.bullet.pos = [self.cannon.pos[0] + 15, 60]
+        self.bullet_state = 'ready'
+        self.update_bullet_velocity()
+        self.timers.cancel('reload')
+
+    def reset_missile(self):
+        self.missile.pos = [self.cannon.pos[0] + 15, 60]
+        self.missile_state = 'ready'
+        self.update_missile_velocity()
+
+    def add_points(self, points: int):
+        """Add to the score and raise 'high_score' the moment the record is beaten"""
+        self.score += points
+        if self.score > self.high_score:
+            self.high_score = self.score
+            self.events.flag('high_score')
+        self.update_level()
+
+    def end_game(self):
+        self.game_over = True
+        self.play_sound('game_over')
+
+        if self.score > self.high_score:
+            self.high_score = self.score
+            self.events.flag('high_score')
+
+        # Clear only game elements
+        self.clear_game_objects()
+        self.events.flag('game_over')
+
+    def remove_power_up(self, power_up):
+        self.power_ups.remove(power_up)
+        self.power_up_pool.release(power_up)
+
+    def update_enemies(self):
+        if self.grace_period:
+            return
+
+        # Every ball sways and falls in one step; speeds come from update_difficulty()
+        balls = self.balls
+        if balls.count:
+            pos = balls.pos[:balls.count]
+            pos[:, 0] += np.sin(pos[:, 1] / 50) * self.ball_sway
+            pos[:, 1] -= self.ball_speed
+
+            fallen = np.flatnonzero(pos[:, 1] < -40)
+            if fallen.size:
+                # A shield stops the first ball to get through; any other ends the game
+                if not self.has_shield:
+                    self.end_game()
+                    return
+                index = int(fallen[0])
+                ball_pos = balls.position(index)
+                balls.remove(index)
+                self.has_shield = False
+                self.timers.cancel('shield')
+                self.create_explosion(ball_pos, [0, 1, 1, 1])
+                self.events.flag('power_up_status')
+                if fallen.size > 1:
+                    self.end_game()
+                    return
+
+        # Blocks drift the same way and drop out below the screen
+        blocks = self.blocks
+        if blocks.count:
+            pos = blocks.pos[:blocks.count]
+            pos[:, 0] += np.sin(pos[:, 1] / 100) * self.time_scale
+            pos[:, 1] -= self.block_speed
+            blocks.keep(pos[:, 1] >= -15)
+
+    def check_collisions(self):
+        # Power-up pickups are handled by update_power_ups()
+        shots = self.projectiles
+        if not shots.count or not self.balls.count:
+            return
+        kind = shots.kind[:shots.count]
+
+        # Every bullet against every ball in one pass; bullets claim balls in
+        # launch order, each taking the first free ball in spawn order
+        bullets = np.flatnonzero(kind == BULLET)
+        if bullets.size:
+            overlaps = self.balls.overlaps(shots.pos[bullets], self.bullet.size)
+            spent = np.zeros(shots.count, bool)
+            targets = []
+            for row in np.flatnonzero(overlaps.any(axis=1)):
+                free = [index for index in np.flatnonzero(overlaps[row]) if index not in targets]
+                if free:
+                    targets.append(free[0])
+                    spent[bullets[row]] = True
+            if targets:
+                # Removing a ball shifts the ones after it, so hits are looked up by id
+                for ball_id in self.balls.ids[targets].tolist():
+                    self.handle_ball_hit(int(np.flatnonzero(self.balls.ids[:self.balls.count] == ball_id)[0]))
+                shots.keep(~spent)
+                kind = shots.kind[:shots.count]
+                self.reload_weapons()
+
+        # Check missile collisions; the blast covers the whole playfield, so
+        # one missile clears every ball and any other flies on
+        missiles = np.flatnonzero(kind == MISSILE)
+        if missiles.size and self.balls.count:
+            index = missiles[0]
+            self.handle_missile_blast(shots.pos[index].tolist())
+            alive = np.ones(shots.count, bool)
+            alive[index] = False
+            shots.keep(alive)
+            self.reload_weapons()
+
+    def handle_missile_blast(self, pos):
+        """Destroy every ball at once; the rules run once for the whole blast, not per ball"""
+        balls = self.balls
+        hit = balls.pos[:balls.count].copy()
+        balls.clear()
+
+        # Missile hits leave the combo alone and award MISSILE_POINTS between them
+        self.add_points(MISSILE_POINTS)
+        self.play_sound('pop')
+        self.create_explosion(pos, COLORS['warning'])
+        self.events.explosions(hit, HIT_COLOR, self.missile_state == 'fire')
+
+    def handle_ball_hit(self, index):
+        ball_pos = self.balls.position(index)
+        self.remove_ball(index)
+
+        self.combo += 1
+        combo_bonus = self.combo if self.combo < 10 else 10  # Cap combo at 10x
+        self.add_points(int(self.score_multiplier * combo_bonus))  # Ensure integer multiplication
+
+        # Track destroyed balls and award missile every 10 balls
+        self.destroyed_balls += 1
+
+        if self.destroyed_balls >= 10:
+            self.missile_number += 1
+            self.destroyed_balls = 0  # Reset counter
+
+        self.play_sound('pop')
+        self.create_explosion(ball_pos, HIT_COLOR)
+        self.schedule('combo', COMBO_WINDOW, self.reset_combo)
+
+    def remove_ball(self, index):
+        self.balls.remove(index)
+
+    def reset_combo(self):
+        self.combo = 0
+        self.timers.cancel('combo')
+
+    def clear_game_objects(self):
+        self.power_up_pool.release_all(self.power_ups)
+        self.balls.clear()
+        self.blocks.clear()
+        self.power_ups.clear()
+        self.projectiles.clear()
+
+    def snapshot(self) -> dict:
+        """The whole game state as JSON-friendly values; timers are stored as time remaining"""
+        return {
+            'seed': self.seed,
+            'rng': self.rng.getstate(),
+            'tick': self.tick,
+            'score': self.score,
+            'level': self.level,
+            'game_over': self.game_over,
+            'grace_remaining': self.time_remaining('grace_period'),
+            'combo': self.combo,
+            'combo_remaining': self.time_remaining('combo'),
+            'destroyed_balls': self.destroyed_balls,
+            'x': self.x,
+            'bullet': {
+                'state': self.bullet_state,
+                'pos': list(self.bullet.pos),
+                'heading': self.bullet_heading,
+                'velocity': [self.bullet_dx, self.bullet_dy],
+                'reload_remaining': self.time_remaining('reload')
+            },
+            'missile': {
+                'state': self.missile_state,
+                'pos': list(self.missile.pos),
+                'heading': self.missile_heading,
+                'velocity': [self.missile_dx, self.missile_dy],
+                'number': self.missile_number
+            },
+            'active_power_ups': {power_type: self.time_remaining(power_type)
+                                 for power_type in self.power_up_types if power_type in self.timers},
+            'power_ups': [[*power_up.pos, power_up.type] for power_up in self.power_ups],
+            'projectiles': {
+                'kind': self.projectiles.kind[:self.projectiles.count].tolist(),
+                'pos': self.projectiles.pos[:self.projectiles.count].tolist(),
+                'velocity': self.projectiles.velocity[:self.projectiles.count].tolist(),
+                'age': self.projectiles.age[:self.projectiles.count].tolist()
+            },
+            'balls': {
+                'pos': self.balls.pos[:self.balls.count].tolist(),
+                'color': self.balls.color[:self.balls.count].tolist()
+            },
+            'blocks': {
+                'pos': self.blocks.pos[:self.blocks.count].tolist(),
+                'color': self.blocks.color[:self.blocks.count].tolist()
+            }
+        }
+
+    def restore(self, state: dict):
+        """Continue a game from snapshot() output, keeping the playfield size and high score"""
+        self.reset(state['seed'])
+        version, internal, gauss = state['rng']
+        self.rng.setstate((version, tuple(internal), gauss))
+        self.tick = state['tick']
+        self.timers.clear(max(self.tick - 1, 0))  # Where step() left the wheel, so timers keep their ticks
+
+        self.score = state['score']
+        self.level = state['level']
+        self.update_difficulty()
+        self.game_over = state['game_over']
+        if state['grace_remaining'] is None:
+            self.end_grace_period()
+        else:
+            self.schedule('grace_period', state['grace_remaining'], self.end_grace_period)
+        self.combo = state['combo']
+        if state['combo_remaining'] is not None:
+            self.schedule('combo', state['combo_remaining'], self.reset_combo)
+        self.destroyed_balls = state['destroyed_balls']
+        self.x = state['x']
+        self.place_cannon()
+
+        for power_type, remaining in state['active_power_ups'].items():
+            self.activate_power_up(power_type, remaining)
+
+        bullet = state['bullet']
+        self.bullet_state = bullet['state']
+        self.bullet.pos = list(bullet['pos'])
+        self.bullet_heading = bullet['heading']
+        self.bullet_dx, self.bullet_dy = bullet['velocity']
+        if bullet['reload_remaining'] is not None:
+            self.schedule('reload', bullet['reload_remaining'], self.reset_bullet)
+        missile = state['missile']
+        self.missile_state = missile['state']
+        self.missile.pos = list(missile['pos'])
+        self.missile_heading = missile['heading']
+        self.missile_dx, self.missile_dy = missile['velocity']
+        self.missile_number = missile['number']
+
+        for x, y, power_type in state['power_ups']:
+            power_up = self.power_up_pool.acquire()
+            power_up.activate((x, y), power_type)
+            self.power_ups.append(power_up)
+        saved = state['projectiles']
+        for kind, pos, velocity, age in zip(saved['kind'], saved['pos'], saved['velocity'], saved['age']):
+            self.projectiles.add(kind, pos, velocity, age)
+        for enemies, saved in ((self.balls, state['balls']), (self.blocks, state['blocks'])):
+            for pos, color in zip(saved['pos'], saved['color']):
+                enemies.add(pos, color)
+
+    def pool_stats(self) -> dict:
+        return {
+            'balls': self.balls.stats(),
+            'projectiles': self.projectiles.stats(),
+            'power_ups': self.power_up_pool.stats()
+        }
@@ -0,0 +1,282 @@
+# Standard library imports
+import argparse
+import gc
+import os
+import sys
+import tempfile
+import tracemalloc
+
+# Kivy reads sys.argv on import unless told not to; the soak has its own options
+os.environ.setdefault('KIVY_NO_ARGS', '1')
+# Clock.tick() would otherwise sleep to hold 60 fps; the soak runs flat out
+os.environ.setdefault('KCFG_GRAPHICS_MAXFPS', '0')
+
+# Kivy imports
+from kivy.clock import Clock
+
+# Game imports (Kivy front-end)
+from game_widget import CannonGame
+from rendering import count_instructions
+
+# Memory growth allowed over the whole run, once warmed up
+MAX_GROWTH_KIB = 256
+
+# Session mode: growth trends allowed, per hour of game time
+MAX_BLOCKS_PER_HOUR = 500
+MAX_KIB_PER_HOUR = 256
+
+# Session mode: a kiosk ends games left running this long, in minutes
+MAX_GAME_MINUTES = 5
+
+FRAME_RATE = 60
+
+
+def aim_and_fire(game: CannonGame, frame: int):
+    """Aim at the first ball every few frames and fire every third of a second"""
+    world = game.world
+    if world.balls and frame % 7 == 0:
+        x, y = world.balls.position(0)
+        game.on_mouse_pos(None, (x + 20, y))
+    if frame % 20 == 0:
+        game.shoot()
+
+
+def play(game: CannonGame, ticks: int, frame: int = 0):
+    """Run the game for `ticks` frames of 1/60 s, aiming at the first ball and firing"""
+    for tick in range(frame, frame + ticks):
+        aim_and_fire(game, tick)
+        game.update(1 / FRAME_RATE)
+        if game.world.game_over:
+            break
+
+
+def footprint(game: CannonGame) -> tuple:
+    """Widgets, canvas instructions and traced bytes, after a full collection"""
+    gc.collect()
+    return len(game.children), count_instructions(game), tracemalloc.get_traced_memory()[0]
+
+
+def soak_restarts(game: CannonGame, restarts: int, ticks: int, warmup: int = 20) -> bool:
+    """
+    Play, lose and restart a game over and over; False if anything grows
+    Args:
+        game: Game widget to restart
+        restarts: Restarts to check
+        ticks: Frames played between restarts
+        warmup: Restarts run first, before the baseline is taken
+    """
+    def cycle(index):
+        play(game, ticks)
+        if index % 3 == 0:
+            game.toggle_pause()  # Restart straight from the pause screen
+        else:
+            if index % 3 == 1:
+                game.toggle_pause()
+                game.toggle_pause()
+            game.world.end_game()
+            game.process_events()
+        game.reset_game()
+
+    for index in range(warmup):
+        cycle(index)
+    widgets, instructions, baseline = footprint(game)
+    print(f"{'restart':>8}{'widgets':>9}{'instructions':>14}{'KiB':>10}")
+    print(f"{0:>8}{widgets:>9}{instructions:>14}{baseline / 1024:>10.1f}")
+
+    ok = True
+    for index in range(1, restarts + 1):
+        cycle(index)
+        if len(game.children) != widgets:
+            print(f"restart {index}: {len(game.children)} widgets, expected {widgets}")
+            ok = False
+            break
+        if index % 100 == 0 or index == restarts:
+            _, count, memory = footprint(game)
+            print(f"{index:>8}{len(game.children):>9}{count:>14}{memory / 1024:>10.1f}")
+            if count != instructions:
+                print(f"restart {index}: {count} canvas instructions, expected {instructions}")
+                ok = False
+                break
+
+    growth = (footprint(game)[2] - baseline) / 1024
+    print(f"memory growth {growth:+.1f} KiB")
+    if growth > MAX_GROWTH_KIB:
+        print(f"memory grew by more than {MAX_GROWTH_KIB} KiB")
+        ok = False
+    return ok
+
+
+def play_session_game(game: CannonGame, frame: int, max_frames: int) -> int:
+    """
+    Play one game the way a kiosk runs it and return the frame it ended on
+    Args:
+        game: Game widget, freshly reset
+        frame: Session frame the game starts on
+        max_frames: Frames after which the game is ended for the next player
+    """
+    start = frame
+    while not game.world.game_over and frame - start < max_frames:
+        # A one second pause every 90 s and a save every 10 minutes
+        if frame % (90 * FRAME_RATE) == 0:
+            game.toggle_pause()
+        elif frame % (90 * FRAME_RATE) == FRAME_RATE and game.paused:
+            game.toggle_pause()
+        if frame % (600 * FRAME_RATE) == 0:
+            game.save_game(None)
+
+        aim_and_fire(game, frame)
+        game.update(1 / FRAME_RATE)
+        Clock.tick()  # Run callbacks scheduled by the game and its worker threads
+        frame += 1
+
+    if game.paused:
+        game.toggle_pause()
+    if not game.world.game_over:
+        game.world.end_game()
+        game.process_events()
+    return frame
+
+
+def trend(samples: list, column: int) -> float:
+    """Least-squares slope of one sample column against game hours"""
+    hours = [sample[0] for sample in samples]
+    values = [sample[column] for sample in samples]
+    mean_hours = sum(hours) / len(hours)
+    mean_value = sum(values) / len(values)
+    spread = sum((h - mean_hours) ** 2 for h in hours)
+    if not spread:
+        return 0.0
+    return sum((h - mean_hours) * (v - mean_value) for h, v in zip(hours, values)) / spread
+
+
+def climbing(samples: list, column: int, per_hour: float) -> bool:
+    """
+    Whether a sample column keeps climbing rather than wandering within bounds
+    Args:
+        samples: (hours, blocks, KiB, instructions) tuples
+        column: Index of the column to check
+        per_hour: Slope allowed before growth counts
+    Returns:
+        True if the trend is steeper than `per_hour` and every later sample is above every earlier one;
+        bounded caches filling and emptying fail the second test
+    """
+    values = [sample[column] for sample in samples]
+    half = len(values) // 2
+    return trend(samples, column) > per_hour and min(values[half:]) > max(values[:half])
+
+
+def soak_session(game: CannonGame, hours: float, interval: float, report_path: str, top: int = 25) -> bool:
+    """
+    Play hours of game time back to back and check that nothing keeps climbing
+    Args:
+        game: Game widget to play
+        hours: Game time to simulate
+        interval: Game minutes between samples; each is taken at the next restart
+        report_path: File the per-allocation-site growth report is written to
+        top: Allocation sites listed in the report
+    Returns:
+        False if canvas instructions changed, or live blocks or traced memory kept climbing
+    """
+    # The session drives the game itself, faster than real time
+    Clock.unschedule(game.update)
+    total_frames = int(hours * 3600 * FRAME_RATE)
+    interval_frames = int(interval * 60 * FRAME_RATE)
+    max_frames = MAX_GAME_MINUTES * 60 * FRAME_RATE
+    ignore = [tracemalloc.Filter(False, tracemalloc.__file__), tracemalloc.Filter(False, '<unknown>')]
+
+    frame = games = 0
+    next_sample = interval_frames  # The first interval warms caches up
+    baseline = None
+    samples = []
+    growth = []
+    print(f"{'hours':>7}{'games':>7}{'blocks':>10}{'instructions':>14}{'KiB':>10}  top growth since baseline")
+    while frame < total_frames:
+        frame = play_session_game(game, frame, max_frames)
+        Clock.tick()
+        game.reset_game()
+        games += 1
+        if frame < next_sample and frame < total_frames:
+            continue
+        next_sample = frame + interval_frames
+
+        # Measured at a restart, when no game state is on screen. Every live
+        # allocation is a traced block; gc.get_objects() would miss objects
+        # CPython does not track, such as dicts of plain values.
+        # The bounded arc cache churns by thousands of blocks, so it is emptied first.
+        game.trajectories.clear()
+        gc.collect()
+        snapshot = tracemalloc.take_snapshot().filter_traces(ignore)
+        blocks = len(snapshot.traces)
+        memory = sum(trace.size for trace in snapshot.traces)
+        instructions = count_instructions(game)
+        samples.append((frame / FRAME_RATE / 3600, blocks, memory / 1024, instructions))
+        if baseline is None:
+            baseline = snapshot
+            note = ''
+        else:
+            growth = sorted(snapshot.compare_to(baseline, 'lineno'), key=lambda stat: stat.size_diff, reverse=True)[:top]
+            note = str(growth[0]) if growth else ''
+        del snapshot
+        print(f"{samples[-1][0]:>7.2f}{games:>7}{blocks:>10}{instructions:>14}{memory / 1024:>10.1f}  {note}")
+
+    ok = True
+    blocks_per_hour = trend(samples, 1)
+    kib_per_hour = trend(samples, 2)
+    print(f"{games} games, {blocks_per_hour:+.0f} blocks/hour, {kib_per_hour:+.1f} KiB/hour")
+    if len(samples) < 3:
+        print("too few samples for a trend; play longer or sample more often")
+        ok = False
+    if any(sample[3] != samples[0][3] for sample in samples):
+        print(f"canvas instructions changed between restarts: {[sample[3] for sample in samples]}")
+        ok = False
+    if climbing(samples, 1, MAX_BLOCKS_PER_HOUR):
+        print(f"live blocks climbing by more than {MAX_BLOCKS_PER_HOUR}/hour")
+        ok = False
+    if climbing(samples, 2, MAX_KIB_PER_HOUR):
+        print(f"traced memory climbing by more than {MAX_KIB_PER_HOUR} KiB/hour")
+        ok = False
+
+    with open(report_path, 'w') as f:
+        f.write(f"{hours} hours, {games} games, sampled every {interval} minutes\n")
+        f.write(f"blocks/hour {blocks_per_hour:+.0f}  KiB/hour {kib_per_hour:+.1f}\n\n")
+        f.write(f"{'hours':>7}{'blocks':>10}{'KiB':>10}{'instructions':>14}\n")
+        for sample_hours, blocks, kib, instructions in samples:
+            f.write(f"{sample_hours:>7.2f}{blocks:>10}{kib:>10.1f}{instructions:>14}\n")
+        f.write("\nGrowth by allocation site, last sample against the first:\n")
+        for stat in growth:
+            f.write(f"{stat}\n")
+    print(f"report written to {report_path}")
+    return ok
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Restart the game many times and check nothing accumulates")
+    parser.add_argument('--restarts', type=int, default=1000)
+    parser.add_argument('--ticks', type=int, default=30, help="Frames played between restarts")
+    parser.add_argument('--seed', type=int, default=1)
+    parser.add_argument('--hours', type=float,
+                        help="Instead of quick restarts, play this many hours of game time as a kiosk would")
+    parser.add_argument('--interval', type=float, default=10, help="Game minutes between session samples")
+    parser.add_argument('--report', default='soak_report.txt', help="Session growth report")
+    args = parser.parse_args(argv)
+    report_path = os.path.abspath(args.report)
+
+    # Replays, high scores and saves land in a scratch directory
+    with tempfile.TemporaryDirectory(prefix='cannon-soak-') as directory:
+        os.chdir(directory)
+        tracemalloc.start()
+        game = CannonGame(seed=args.seed)
+        try:
+            if args.hours:
+                ok = soak_session(game, args.hours, args.interval, report_path)
+            else:
+                ok = soak_restarts(game, args.restarts, args.ticks)
+        finally:
+            game.shutdown()
+            tracemalloc.stop()
+    print("ok" if ok else "FAILED")
+    return 0 if ok else 1
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,62 @@
+class SpatialHash:
+    """Uniform grid broad-phase for overlap queries
+
+    Objects are bucketed by the grid cells their bounding box touches, so a
+    query only looks at objects near the query shape instead of all of them.
+    The grid is rebuilt from an object list each tick; query results come
+    back in that list's order and stay valid until the list changes.
+    """
+    def __init__(self, cell_size: float = 64):
+        """
+        Initialize a spatial hash
+        Args:
+            cell_size: Width and height of a grid cell in pixels; about the
+                size of the largest object keeps each one in few cells
+        """
+        self.cell_size = cell_size
+        self.cells = {}
+        self.objects = []
+
+    def cell_range(self, x: float, y: float, width: float, height: float):
+        size = self.cell_size
+        return (int(x // size), int((x + width) // size),
+                int(y // size), int((y + height) // size))
+
+    def rebuild(self, objects):
+        """Index every object in the list by its pos and size"""
+        cells = self.cells
+        cells.clear()
+        self.objects = objects
+        for index, obj in enumerate(objects):
+            x, y = obj.pos
+            width, height = obj.size
+            x0, x1, y0, y1 = self.cell_range(x, y, width, height)
+            for cx in range(x0, x1 + 1):
+                for cy in range(y0, y1 + 1):
+                    bucket = cells.get((cx, cy))
+                    if bucket is None:
+                        cells[(cx, cy)] = [index]
+                    else:
+                        bucket.append(index)
+
+    def candidates(self, x0: int, x1: int, y0: int, y1: int) -> list:
+        cells = self.cells
+        found = set()
+        for cx in range(x0, x1 + 1):
+            for cy in range(y0, y1 + 1):
+                bucket = cells.get((cx, cy))
+                if bucket:
+                    found.update(bucket)
+        return sorted(found)
+
+    def query_box(self, x: float, y: float, width: float, height: float) -> list:
+        """Objects whose bounding box overlaps the given box"""
+        objects = self.objects
+        result = []
+        for index in self.candidates(*self.cell_range(x, y, width, height)):
+            obj = objects[index]
+            ox, oy = obj.pos
+            if (x < ox + obj.size[0] and x + width > ox and
+                    y < oy + obj.size[1] and y + height > oy):
+                result.append(obj)
+        return result
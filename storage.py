@@ -0,0 +1,249 @@
+# Standard library imports
+import json
+import os
+import tempfile
+import time
+import zlib
+from concurrent.futures import ThreadPoolExecutor
+
+# Game imports
+from projectiles import BULLET, MISSILE
+from simulation import WINDOW_HEIGHT, WINDOW_WIDTH, World
+
+# File layout: MAGIC followed by zlib-compressed JSON of World.snapshot()
+# plus a version field. Version 1 was save_game.json with only score, level
+# and missile count; version 2 kept at most one bullet and one missile in
+# flight inside the weapon state. Both are migrated on load.
+MAGIC = b'CGSV'
+SAVE_VERSION = 3
+SAVE_PATH = 'save_game.cgs'
+LEGACY_SAVE_PATH = 'save_game.json'
+
+HIGH_SCORE_PATH = 'high_score.json'
+HIGH_SCORE_FLUSH_INTERVAL = 5.0  # Seconds between high score writes during a run
+
+
+def write_atomic(path: str, data: bytes):
+    """Replace a file with new contents so a crash leaves either the old or the new file"""
+    directory = os.path.dirname(os.path.abspath(path))
+    fd, temp_path = tempfile.mkstemp(dir=directory, prefix=f".{os.path.basename(path)}.", suffix='.tmp')
+    try:
+        with os.fdopen(fd, 'wb') as f:
+            f.write(data)
+            f.flush()
+            os.fsync(f.fileno())
+        os.chmod(temp_path, 0o644)  # mkstemp files are private to the owner
+        os.replace(temp_path, path)
+    except BaseException:
+        try:
+            os.remove(temp_path)
+        except OSError:
+            pass
+        raise
+
+
+def encode_snapshot(state: dict) -> bytes:
+    payload = json.dumps({'version': SAVE_VERSION, **state}, separators=(',', ':'))
+    return MAGIC + zlib.compress(payload.encode('utf-8'), 9)
+
+
+def decode_snapshot(data: bytes) -> dict:
+    if data[:len(MAGIC)] != MAGIC:
+        raise ValueError("Not a save file")
+    state = json.loads(zlib.decompress(data[len(MAGIC):]))
+    version = state.pop('version', None)
+    if version == 2:
+        return migrate_v2(state)
+    if version != SAVE_VERSION:
+        raise ValueError(f"Unsupported save version {version}")
+    return state
+
+
+def migrate_v1(data: dict) -> dict:
+    """Turn an old save_game.json into a snapshot; everything it lacks starts fresh"""
+    world = World(WINDOW_WIDTH, WINDOW_HEIGHT)
+    world.score = data['score']
+    world.level = data['level']
+    world.missile_number = data['Missiles']
+    world.update_difficulty()
+    return world.snapshot()
+
+
+def migrate_v2(state: dict) -> dict:
+    """Move a version 2 save's shots in flight into the projectile list"""
+    projectiles = {'kind': [], 'pos': [], 'velocity': [], 'age': []}
+    for kind, weapon in ((BULLET, state['bullet']), (MISSILE, state['missile'])):
+        if weapon['state'] == 'fire':
+            projectiles['kind'].append(kind)
+            projectiles['pos'].append(weapon['pos'])
+            projectiles['velocity'].append(weapon['velocity'])
+            projectiles['age'].append(0)
+    state['bullet']['reload_remaining'] = None
+    state['projectiles'] = projectiles
+    return state
+
+
+def check_snapshot(state: dict) -> dict:
+    """
+    Check that a decoded save can be played before any live game is touched
+    Args:
+        state: Decoded or migrated snapshot
+    Returns:
+        The same state
+    Raises:
+        ValueError naming the first problem found
+    """
+    # Restoring into a scratch world finds missing keys and malformed values
+    world = World(WINDOW_WIDTH, WINDOW_HEIGHT)
+    try:
+        world.restore(state)
+    except (AttributeError, IndexError, KeyError, TypeError, ValueError) as e:
+        raise ValueError(f"Corrupt save: {e!r}") from e
+
+    # Values restore() takes as they are but the rules would trip over later
+    for name in ('tick', 'score', 'level', 'combo', 'destroyed_balls', 'missile_number'):
+        value = getattr(world, name)
+        if not isinstance(value, int) or isinstance(value, bool) or value < 0:
+            raise ValueError(f"Corrupt save: bad {name} {value!r}")
+    if world.level < 1:
+        raise ValueError(f"Corrupt save: bad level {world.level!r}")
+    for name in ('x', 'bullet_heading', 'missile_heading', 'bullet_dx', 'bullet_dy', 'missile_dx', 'missile_dy'):
+        value = getattr(world, name)
+        if not isinstance(value, (int, float)) or isinstance(value, bool):
+            raise ValueError(f"Corrupt save: bad {name} {value!r}")
+    for name in ('bullet_state', 'missile_state'):
+        if getattr(world, name) not in ('ready', 'fire', 'not ready'):
+            raise ValueError(f"Corrupt save: bad {name} {getattr(world, name)!r}")
+    unknown = (set(state['active_power_ups']) | {power_up[2] for power_up in state['power_ups']}) - set(world.power_up_types)
+    if unknown:
+        raise ValueError(f"Corrupt save: unknown power-ups {sorted(unknown)}")
+    for name, width in (('pos', 2), ('color', 4)):
+        for group in ('balls', 'blocks'):
+            if any(len(row) != width for row in state[group][name]):
+                raise ValueError(f"Corrupt save: bad {group} {name}")
+    for name in ('pos', 'velocity'):
+        if any(len(row) != 2 for row in state['projectiles'][name]):
+            raise ValueError(f"Corrupt save: bad projectile {name}")
+    kinds = set(world.projectiles.kind[:world.projectiles.count].tolist())
+    if not kinds <= {BULLET, MISSILE}:
+        raise ValueError(f"Corrupt save: unknown projectile kinds {sorted(kinds)}")
+    return state
+
+
+class SaveStore:
+    """Saves and loads game snapshots on a background thread
+
+    Encoding, compression and file I/O all happen on a single worker, so
+    requests run in the order they were made and a load always sees the
+    last save. Results go to a callback through `dispatch`, which lets a
+    front-end hand them back to its own thread.
+    """
+    def __init__(self, path: str = SAVE_PATH, legacy_path: str = LEGACY_SAVE_PATH, dispatch=None):
+        """
+        Initialize a save store
+        Args:
+            path: Snapshot file
+            legacy_path: Old-format save, read only when there is no snapshot yet
+            dispatch: Callable(callback, *args) used to deliver results; None
+                calls the callback directly on the worker thread
+        """
+        self.path = path
+        self.legacy_path = legacy_path
+        self.dispatch = dispatch or (lambda callback, *args: callback(*args))
+        self.executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix='storage')
+
+    def save(self, state: dict, callback=None):
+        """Write a World.snapshot(); callback(error) gets None on success"""
+        self.executor.submit(self._save, state, callback)
+
+    def load(self, callback):
+        """Read the latest save; callback(state, error) gets exactly one of them"""
+        self.executor.submit(self._load, callback)
+
+    def _save(self, state, callback):
+        error = None
+        try:
+            write_atomic(self.path, encode_snapshot(state))
+        except (OSError, TypeError, ValueError) as e:
+            error = e
+        if callback is not None:
+            self.dispatch(callback, error)
+
+    def _load(self, callback):
+        state = error = None
+        try:
+            if os.path.exists(self.path) or not os.path.exists(self.legacy_path):
+                with open(self.path, 'rb') as f:
+                    state = check_snapshot(decode_snapshot(f.read()))
+            else:
+                with open(self.legacy_path, 'r') as f:
+                    state = check_snapshot(migrate_v1(json.load(f)))
+        except (OSError, KeyError, TypeError, ValueError, zlib.error) as e:
+            error = e
+            state = None
+        self.dispatch(callback, state, error)
+
+    def shutdown(self):
+        """Finish pending writes"""
+        self.executor.shutdown(wait=True)
+
+
+class HighScoreStore:
+    """The high score, kept in memory and written behind
+
+    A new record only marks the score dirty. maybe_flush() writes it at
+    most once per `interval` seconds and flush() writes it right away, for
+    the end of a game and app shutdown. Writes are atomic, so a crash
+    mid-write leaves the previous record intact.
+    """
+    def __init__(self, path: str = HIGH_SCORE_PATH, interval: float = HIGH_SCORE_FLUSH_INTERVAL,
+                 executor=None):
+        """
+        Initialize a high score store, reading the current record
+        Args:
+            path: High score file
+            interval: Minimum seconds between writes from maybe_flush()
+            executor: Executor to write on, e.g. SaveStore.executor; None writes
+                on the calling thread
+        """
+        self.path = path
+        self.interval = interval
+        self.executor = executor
+        self.score = self.read()
+        self.dirty = False
+        self.last_flush = time.monotonic()
+        self.writes = 0
+
+    def read(self) -> int:
+        try:
+            with open(self.path, 'r') as f:
+                return json.load(f)['high_score']
+        except (OSError, KeyError, TypeError, ValueError):
+            return 0
+
+    def set(self, score: int):
+        if score > self.score:
+            self.score = score
+            self.dirty = True
+
+    def maybe_flush(self):
+        if self.dirty and time.monotonic() - self.last_flush >= self.interval:
+            self.flush()
+
+    def flush(self):
+        if not self.dirty:
+            return
+        self.dirty = False
+        self.last_flush = time.monotonic()
+        self.writes += 1
+        data = json.dumps({'high_score': self.score}).encode('utf-8')
+        if self.executor is not None:
+            self.executor.submit(self._write, data)
+        else:
+            self._write(data)
+
+    def _write(self, data: bytes):
+        try:
+            write_atomic(self.path, data)
+        except OSError as e:
+            print(f"Could not save high score: {e}")
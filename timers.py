@@ -0,0 +1,70 @@
+class TimerWheel:
+    """Keyed game-time timers, fired by tick from a hashed timing wheel
+
+    A timer due at tick t lives in slot t % slots, so each tick only looks
+    at one slot instead of every pending timer; timers further out than
+    one turn of the wheel wait in their slot until their tick comes round.
+    Scheduling a key that is already pending replaces it, so a refreshed
+    effect can never be cut short by its older timer. The wheel only moves
+    when advance() is called, which makes it pause with the simulation.
+    """
+    def __init__(self, slots: int = 512):
+        """
+        Initialize a timer wheel
+        Args:
+            slots: Ticks covered by one turn of the wheel
+        """
+        self.slots = [{} for _ in range(slots)]  # key -> due tick
+        self.timers = {}  # key -> (due tick, callback)
+        self.tick = 0
+
+    def __contains__(self, key) -> bool:
+        return key in self.timers
+
+    def __len__(self) -> int:
+        return len(self.timers)
+
+    def schedule(self, key, delay: int, callback):
+        """
+        Run callback() `delay` ticks from now, replacing any timer with the same key
+        Args:
+            key: Hashable timer name
+            delay: Ticks to wait; at least one
+            callback: Callable taking no arguments
+        """
+        self.cancel(key)
+        due = self.tick + max(1, delay)
+        self.slots[due % len(self.slots)][key] = due
+        self.timers[key] = (due, callback)
+
+    def cancel(self, key):
+        timer = self.timers.pop(key, None)
+        if timer is not None:
+            del self.slots[timer[0] % len(self.slots)][key]
+
+    def remaining(self, key) -> int:
+        """Ticks until a pending timer fires, or None"""
+        timer = self.timers.get(key)
+        return None if timer is None else timer[0] - self.tick
+
+    def clear(self, tick: int = 0):
+        """Drop every timer and restart the wheel at `tick`"""
+        for slot in self.slots:
+            slot.clear()
+        self.timers.clear()
+        self.tick = tick
+
+    def advance(self, tick: int):
+        """Move to `tick` and fire the timers due then; call once per tick, in order"""
+        self.tick = tick
+        slot = self.slots[tick % len(self.slots)]
+        if not slot:
+            return
+        due = [key for key, due_tick in slot.items() if due_tick == tick]
+        callbacks = []
+        for key in due:
+            del slot[key]
+            callbacks.append(self.timers.pop(key)[1])
+        # Callbacks may schedule new timers, so they run once the wheel is consistent
+        for callback in callbacks:
+            callback()
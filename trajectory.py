@@ -0,0 +1,129 @@
+# Standard library imports
+from collections import OrderedDict
+from math import cos, radians, sin
+
+# Game imports
+from simulation import GRAVITY, MISSILE_GRAVITY
+
+# Longest flight the preview follows, in ticks at the tuned rate
+MAX_PREVIEW_TICKS = 600
+
+
+def bullet_arc(x: float, y: float, dx: float, dy: float, width: float, height: float,
+               time_scale: float = 1.0) -> list:
+    """
+    Step a bullet the way World.update_projectiles() does until it leaves the playfield
+    Args:
+        x, y: Start position of the bullet's lower-left corner
+        dx, dy: Velocity per tuned tick
+        width, height: Playfield size
+        time_scale: World.time_scale
+    Returns:
+        Flat [x0, y0, x1, y1, ...] list of corner positions
+    """
+    points = [x, y]
+    gravity = GRAVITY * time_scale
+    for _ in range(int(MAX_PREVIEW_TICKS / time_scale)):
+        x += dx * time_scale
+        y += dy * time_scale
+        dy -= gravity
+        points += (x, y)
+        if x < 0 or x > width or y < 0 or y > height:
+            break
+    return points
+
+
+def missile_arc(x: float, y: float, dx: float, dy: float, size, width: float, height: float,
+                time_scale: float = 1.0) -> list:
+    """Like bullet_arc(), for a missile: lighter gravity, wall and ceiling bounces, gone at the floor"""
+    points = [x, y]
+    gravity = MISSILE_GRAVITY * time_scale
+    max_x = width - size[0]
+    max_y = height - size[1]
+    for _ in range(int(MAX_PREVIEW_TICKS / time_scale)):
+        x += dx * time_scale
+        y += dy * time_scale
+        dy -= gravity
+        if x < 0:
+            x = 0
+            dx = abs(dx)
+        elif x > max_x:
+            x = max_x
+            dx = -abs(dx)
+        if y > max_y:
+            y = max_y
+            dy = -abs(dy)
+        points += (x, y)
+        if y < 0:
+            break
+    return points
+
+
+class TrajectoryCache:
+    """Preview arcs for the ready weapon, cached by quantized launch parameters
+
+    Aiming moves the heading in tiny steps every mouse event. Rounding the
+    heading and start position to a small grid lets nearby aims share one
+    computed arc, and a least-recently-used cache keeps the arcs for the
+    angles the player keeps coming back to.
+    """
+    def __init__(self, capacity: int = 256, heading_step: float = 0.5, position_step: float = 2.0):
+        """
+        Initialize a trajectory cache
+        Args:
+            capacity: Arcs kept before the least recently used is dropped
+            heading_step: Heading quantum in degrees
+            position_step: Start position quantum in pixels
+        """
+        self.capacity = capacity
+        self.heading_step = heading_step
+        self.position_step = position_step
+        self.arcs = OrderedDict()
+        self.hits = 0
+        self.misses = 0
+
+    def points(self, world) -> tuple:
+        """Flat points of the ready projectile's path, from its center; empty if none is ready"""
+        if world.game_over:
+            return ()
+        if world.bullet_state == 'ready':
+            kind, projectile, heading, speed = 'bullet', world.bullet, world.bullet_heading, world.bullet_speed
+        elif world.missile_state == 'ready':
+            kind, projectile, heading, speed = 'missile', world.missile, world.missile_heading, world.missile_speed
+        else:
+            return ()
+
+        step = self.position_step
+        key = (kind, round(heading / self.heading_step), speed,
+               round(projectile.pos[0] / step), round(projectile.pos[1] / step),
+               world.width, world.height, world.time_scale)
+        arc = self.arcs.get(key)
+        if arc is not None:
+            self.hits += 1
+            self.arcs.move_to_end(key)
+            return arc
+
+        self.misses += 1
+        heading = radians(key[1] * self.heading_step)
+        x, y = key[3] * step, key[4] * step
+        dx, dy = speed * cos(heading), speed * sin(heading)
+        if kind == 'bullet':
+            corners = bullet_arc(x, y, dx, dy, world.width, world.height, world.time_scale)
+        else:
+            corners = missile_arc(x, y, dx, dy, projectile.size, world.width, world.height,
+                                  world.time_scale)
+
+        # Draw from the projectile's center rather than its corner
+        half_width, half_height = projectile.size[0] / 2, projectile.size[1] / 2
+        arc = tuple(value + (half_width if index % 2 == 0 else half_height)
+                    for index, value in enumerate(corners))
+        self.arcs[key] = arc
+        if len(self.arcs) > self.capacity:
+            self.arcs.popitem(last=False)
+        return arc
+
+    def clear(self):
+        self.arcs.clear()
+
+    def stats(self) -> dict:
+        return {'arcs': len(self.arcs), 'hits': self.hits, 'misses': self.misses}
@@ -0,0 +1,391 @@
+# Standard library imports
+import argparse
+import math
+import sys
+import time
+
+# Third-party imports
+import numpy as np
+
+# Game imports
+from simulation import (
+    BALL_SIZE, BASE_TICK_RATE, BULLET_SIZE, BULLET_SPEED, COMBO_WINDOW, GRACE_PERIOD, GRAVITY,
+    MISSILE_GRAVITY, MISSILE_POINTS, MISSILE_SIZE, MISSILE_SPEED, TICK_RATE, WINDOW_HEIGHT, WINDOW_WIDTH,
+    DifficultyParams
+)
+
+# One action per game per step, mirroring the World methods of the same names
+NOOP = 0
+TURN_LEFT = 1
+TURN_RIGHT = 2
+MOVE_LEFT = 3
+MOVE_RIGHT = 4
+FIRE = 5
+SWITCH = 6
+ACTION_COUNT = 7
+
+# Weapon states, as World.bullet_state and World.missile_state
+READY = 0
+FIRING = 1
+NOT_READY = 2
+
+# Observation layout: these values, then (x, y, alive) for every ball slot
+STATE_FEATURES = ('cannon_x', 'bullet_heading', 'missile_heading', 'bullet_ready', 'missile_ready',
+                  'missile_number', 'level', 'bullet_x', 'bullet_y', 'missile_x', 'missile_y')
+
+
+class VecCannonEnv:
+    """N independent cannon games stepped together in batched NumPy arrays
+
+    Follows the rules of World.step() for the cannon, both weapons, ball
+    spawning and movement, hits, combos and levels, but keeps each value
+    as one array across all games, so a step costs the same few array
+    operations whether it runs one game or thousands. Power-ups are left
+    out, and randomness comes from one NumPy generator for the batch, so
+    games are not replays of a World with the same seed.
+
+    step() takes one action per game and returns observations, rewards
+    (points scored under World's hit rules) and done flags.
+    Finished games start over at once; their final score and level stay
+    in final_score and final_level until they finish again.
+    """
+    def __init__(self, num_envs: int, width: float = WINDOW_WIDTH, height: float = WINDOW_HEIGHT,
+                 tick_rate: int = TICK_RATE, difficulty: DifficultyParams = None, seed: int = None):
+        """
+        Initialize a batch of games
+        Args:
+            num_envs: Number of games
+            width: Playfield width in pixels
+            height: Playfield height in pixels
+            tick_rate: Simulation steps per second of game time
+            difficulty: Difficulty curve; None uses the tuned defaults
+            seed: Seed for the batch's random generator; None picks a fresh one
+        """
+        self.num_envs = num_envs
+        self.width = width
+        self.height = height
+        self.tick_rate = tick_rate
+        self.time_scale = BASE_TICK_RATE / tick_rate
+        self.difficulty = difficulty or DifficultyParams()
+        self.grace_ticks = math.ceil(GRACE_PERIOD * tick_rate - 1e-9)
+        self.combo_ticks = math.ceil(COMBO_WINDOW * tick_rate - 1e-9)
+
+        # Enough ball slots for the most the difficulty curve ever allows at once
+        params = self.difficulty
+        if params.ball_decay > 0:
+            self.max_slots = math.ceil(params.initial_balls + params.ball_increment / params.ball_decay)
+        else:
+            self.max_slots = 64
+        self.observation_size = len(STATE_FEATURES) + 3 * self.max_slots
+
+        n, m = num_envs, self.max_slots
+        self.tick = np.zeros(n, np.int64)
+        self.score = np.zeros(n, np.int64)
+        self.level = np.ones(n, np.int64)
+        self.combo = np.zeros(n, np.int64)
+        self.combo_timer = np.zeros(n, np.int64)  # Ticks until the combo lapses
+        self.destroyed_balls = np.zeros(n, np.int64)
+        self.x = np.zeros(n)
+        self.bullet_state = np.zeros(n, np.int8)
+        self.missile_state = np.zeros(n, np.int8)
+        self.missile_number = np.zeros(n, np.int64)
+        self.bullet_heading = np.zeros(n)
+        self.missile_heading = np.zeros(n)
+        self.bullet_pos = np.zeros((n, 2))
+        self.missile_pos = np.zeros((n, 2))
+        self.bullet_velocity = np.zeros((n, 2))
+        self.missile_velocity = np.zeros((n, 2))
+        self.ball_pos = np.zeros((n, m, 2))
+        self.ball_alive = np.zeros((n, m), bool)
+        self.ball_order = np.zeros((n, m), np.int64)  # Spawn sequence, for hit priority
+        self.final_score = np.zeros(n, np.int64)
+        self.final_level = np.zeros(n, np.int64)
+        self.reset(seed)
+
+    def reset(self, seed: int = None) -> np.ndarray:
+        """Start every game over; returns the first observations"""
+        self.rng = np.random.default_rng(seed)
+        self.next_order = 0
+        self._reset_games(np.ones(self.num_envs, bool))
+        return self.observations()
+
+    def _reset_games(self, games):
+        """Put the games selected by a boolean mask back to their starting state"""
+        self.tick[games] = 0
+        self.score[games] = 0
+        self.level[games] = 1
+        self.combo[games] = 0
+        self.combo_timer[games] = 0
+        self.destroyed_balls[games] = 0
+        self.x[games] = 0
+        self.bullet_state[games] = READY
+        self.missile_state[games] = NOT_READY
+        self.missile_number[games] = 3
+        self.bullet_heading[games] = 90
+        self.missile_heading[games] = 90
+        for pos in (self.bullet_pos, self.missile_pos):
+            pos[games, 0] = self.cannon_x()[games] + 5
+            pos[games, 1] = 70
+        self.ball_alive[games] = False
+        self.update_difficulty()
+
+    def cannon_x(self) -> np.ndarray:
+        return self.width / 2 + self.x + 15
+
+    def update_difficulty(self):
+        """Per-game spawn and movement values, by the formulas of World.update_difficulty()"""
+        params = self.difficulty
+        level = self.level
+        k = self.time_scale
+        self.max_balls = params.initial_balls + (level * params.ball_increment) / (1 + level * params.ball_decay)
+        self.spawn_chance = (params.spawn_base + level * params.spawn_increment) * k
+        base_speed = params.initial_speed + (level * params.speed_increment) / (1 + level * params.speed_decay)
+        self.ball_speed = base_speed * k
+        self.ball_sway = 2 * (1 + level * params.movement_intensity) * k
+
+    def step(self, actions):
+        """
+        Advance every game by one tick
+        Args:
+            actions: (num_envs,) integer actions, NOOP through SWITCH
+        Returns:
+            (observations, rewards, dones): (num_envs, observation_size) float32
+            observations, (num_envs,) points scored this step and (num_envs,)
+            flags for games that ended; those have already been restarted
+        """
+        actions = np.asarray(actions)
+        rewards = np.zeros(self.num_envs, np.int64)
+
+        # Combos lapse when their timer runs out, before this tick's input
+        counting = self.combo_timer > 0
+        self.combo_timer[counting] -= 1
+        self.combo[counting & (self.combo_timer == 0)] = 0
+
+        self.apply_actions(actions)
+        self.update_projectiles()
+        playing = self.tick >= self.grace_ticks
+        self.spawn_balls(playing)
+        dones = self.update_balls(playing)
+        self.check_collisions(~dones, rewards)
+
+        self.score += rewards
+        new_level = self.score // self.difficulty.points_per_level + 1
+        if np.any(new_level > self.level):
+            self.level = np.maximum(self.level, new_level)
+            self.update_difficulty()
+        self.tick += 1
+
+        if dones.any():
+            self.final_score[dones] = self.score[dones]
+            self.final_level[dones] = self.level[dones]
+            self._reset_games(dones)
+        return self.observations(), rewards, dones
+
+    def apply_actions(self, actions):
+        bullet_ready = self.bullet_state == READY
+        missile_ready = (self.missile_state == READY) & ~bullet_ready
+
+        # Turning moves whichever weapon is loaded
+        for action, turn in ((TURN_LEFT, 10), (TURN_RIGHT, -10)):
+            chosen = actions == action
+            self.bullet_heading[chosen & bullet_ready] += turn
+            self.missile_heading[chosen & missile_ready] += turn
+
+        # Moving carries loaded rounds along with the cannon
+        target = self.x - 30
+        left = (actions == MOVE_LEFT) & (self.width / 2 + target > 0)
+        target = self.x + 30
+        right = (actions == MOVE_RIGHT) & (self.width / 2 + target < self.width - 50)
+        self.x[left] -= 30
+        self.x[right] += 30
+        moved = left | right
+        cannon_x = self.cannon_x()
+        for ready, pos in ((bullet_ready, self.bullet_pos), (missile_ready, self.missile_pos)):
+            carried = moved & ready
+            pos[carried, 0] = cannon_x[carried] + 5
+            pos[carried, 1] = 70
+
+        fire = actions == FIRE
+        shoot = fire & bullet_ready
+        self.bullet_state[shoot] = FIRING
+        self.bullet_velocity[shoot] = self.launch_velocity(self.bullet_heading[shoot], BULLET_SPEED)
+        shoot = fire & missile_ready & (self.missile_number > 0)
+        self.missile_state[shoot] = FIRING
+        self.missile_number[shoot] -= 1
+        self.missile_velocity[shoot] = self.launch_velocity(self.missile_heading[shoot], MISSILE_SPEED)
+
+        switch = actions == SWITCH
+        to_missile = switch & bullet_ready
+        to_bullet = switch & missile_ready
+        self.bullet_state[to_missile] = NOT_READY
+        self.missile_state[to_missile] = READY
+        self.bullet_state[to_bullet] = READY
+        self.missile_state[to_bullet] = NOT_READY
+
+    @staticmethod
+    def launch_velocity(heading, speed: float) -> np.ndarray:
+        heading = np.radians(heading)
+        return np.stack([speed * np.cos(heading), speed * np.sin(heading)], axis=1)
+
+    def update_projectiles(self):
+        k = self.time_scale
+
+        flying = self.bullet_state == FIRING
+        if flying.any():
+            pos = self.bullet_pos
+            pos[flying] += self.bullet_velocity[flying] * k
+            self.bullet_velocity[flying, 1] -= GRAVITY * k
+            gone = flying & ((pos[:, 0] < 0) | (pos[:, 0] > self.width) |
+                             (pos[:, 1] < 0) | (pos[:, 1] > self.height))
+            self.reset_bullets(gone)
+
+        flying = self.missile_state == FIRING
+        if flying.any():
+            pos, velocity = self.missile_pos, self.missile_velocity
+            pos[flying] += velocity[flying] * k
+            velocity[flying, 1] -= MISSILE_GRAVITY * k
+            max_x = self.width - MISSILE_SIZE[0]
+            max_y = self.height - MISSILE_SIZE[1]
+            left = flying & (pos[:, 0] < 0)
+            right = flying & (pos[:, 0] > max_x)
+            top = flying & (pos[:, 1] > max_y)
+            pos[left, 0] = 0
+            velocity[left, 0] = np.abs(velocity[left, 0])
+            pos[right, 0] = max_x
+            velocity[right, 0] = -np.abs(velocity[right, 0])
+            pos[top, 1] = max_y
+            velocity[top, 1] = -np.abs(velocity[top, 1])
+            self.reset_missiles(flying & ~top & (pos[:, 1] < 0))
+
+    def reset_bullets(self, games):
+        self.bullet_pos[games, 0] = self.cannon_x()[games] + 15
+        self.bullet_pos[games, 1] = 60
+        self.bullet_state[games] = READY
+
+    def reset_missiles(self, games):
+        self.missile_pos[games, 0] = self.cannon_x()[games] + 15
+        self.missile_pos[games, 1] = 60
+        self.missile_state[games] = READY
+
+    def spawn_balls(self, playing):
+        # One draw per game per tick, like World.spawn_enemies()
+        count = self.ball_alive.sum(axis=1)
+        spawn = playing & (count < self.max_balls) & (self.rng.random(self.num_envs) < self.spawn_chance)
+        games = np.flatnonzero(spawn)
+        if not games.size:
+            return
+        slots = np.argmin(self.ball_alive[games], axis=1)  # First free slot
+        self.ball_pos[games, slots, 0] = self.rng.integers(100, self.width - 100, games.size, endpoint=True)
+        self.ball_pos[games, slots, 1] = self.height
+        self.ball_alive[games, slots] = True
+        self.ball_order[games, slots] = self.next_order + np.arange(games.size)
+        self.next_order += games.size
+
+    def update_balls(self, playing) -> np.ndarray:
+        """Sway and drop every ball; returns which games lost a ball off the bottom"""
+        pos = self.ball_pos
+        moving = playing[:, None]
+        pos[:, :, 0] += np.where(moving, np.sin(pos[:, :, 1] / 50) * self.ball_sway[:, None], 0)
+        pos[:, :, 1] -= np.where(moving, self.ball_speed[:, None], 0)
+        return (self.ball_alive & (pos[:, :, 1] < -40)).any(axis=1)
+
+    def check_collisions(self, live, rewards):
+        balls = self.ball_pos
+        alive = self.ball_alive
+
+        # Bullets take the earliest-spawned ball they overlap
+        flying = live & (self.bullet_state == FIRING)
+        bx, by = self.bullet_pos[:, 0:1], self.bullet_pos[:, 1:2]
+        overlap = (alive & flying[:, None] &
+                   (bx < balls[:, :, 0] + BALL_SIZE[0]) & (bx + BULLET_SIZE[0] > balls[:, :, 0]) &
+                   (by < balls[:, :, 1] + BALL_SIZE[1]) & (by + BULLET_SIZE[1] > balls[:, :, 1]))
+        hit = overlap.any(axis=1)
+        if hit.any():
+            games = np.flatnonzero(hit)
+            order = np.where(overlap[games], self.ball_order[games], np.iinfo(np.int64).max)
+            alive[games, np.argmin(order, axis=1)] = False
+            self.combo[games] += 1
+            rewards[games] += np.minimum(self.combo[games], 10)
+            self.combo_timer[games] = self.combo_ticks
+            self.destroyed_balls[games] += 1
+            earned = hit & (self.destroyed_balls >= 10)
+            self.missile_number[earned] += 1
+            self.destroyed_balls[earned] = 0
+            self.reset_bullets(hit)
+
+        # A missile clears the playfield; its points are shared among the balls
+        blast = live & (self.missile_state == FIRING) & alive.any(axis=1)
+        if blast.any():
+            rewards[blast] += MISSILE_POINTS
+            alive[blast] = False
+            self.reset_missiles(blast)
+
+    def observations(self) -> np.ndarray:
+        """(num_envs, observation_size) float32 array, positions scaled to the playfield"""
+        obs = np.empty((self.num_envs, self.observation_size), np.float32)
+        obs[:, 0] = self.cannon_x() / self.width
+        obs[:, 1] = self.bullet_heading / 180
+        obs[:, 2] = self.missile_heading / 180
+        obs[:, 3] = self.bullet_state == READY
+        obs[:, 4] = self.missile_state == READY
+        obs[:, 5] = self.missile_number
+        obs[:, 6] = self.level
+        obs[:, 7] = self.bullet_pos[:, 0] / self.width
+        obs[:, 8] = self.bullet_pos[:, 1] / self.height
+        obs[:, 9] = self.missile_pos[:, 0] / self.width
+        obs[:, 10] = self.missile_pos[:, 1] / self.height
+        balls = obs[:, len(STATE_FEATURES):].reshape(self.num_envs, self.max_slots, 3)
+        balls[:, :, 0] = self.ball_pos[:, :, 0] / self.width
+        balls[:, :, 1] = self.ball_pos[:, :, 1] / self.height
+        balls[:, :, 2] = self.ball_alive
+        balls[~self.ball_alive, :2] = 0
+        return obs
+
+
+def main(argv=None):
+    # Local import: only the comparison needs the object-per-game simulation
+    from simulation import (
+        FIRE as WORLD_FIRE, MOVE_LEFT as WORLD_MOVE_LEFT, MOVE_RIGHT as WORLD_MOVE_RIGHT,
+        SWITCH as WORLD_SWITCH, TURN_LEFT as WORLD_TURN_LEFT, TURN_RIGHT as WORLD_TURN_RIGHT, World
+    )
+    world_actions = {
+        TURN_LEFT: WORLD_TURN_LEFT, TURN_RIGHT: WORLD_TURN_RIGHT, MOVE_LEFT: WORLD_MOVE_LEFT,
+        MOVE_RIGHT: WORLD_MOVE_RIGHT, FIRE: WORLD_FIRE, SWITCH: WORLD_SWITCH
+    }
+
+    parser = argparse.ArgumentParser(description="Time the batched environment against one World per game")
+    parser.add_argument('--envs', type=int, default=1024)
+    parser.add_argument('--steps', type=int, default=300)
+    parser.add_argument('--seed', type=int, default=1)
+    args = parser.parse_args(argv)
+
+    rng = np.random.default_rng(args.seed)
+    actions = rng.integers(0, ACTION_COUNT, (args.steps, args.envs))
+
+    env = VecCannonEnv(args.envs, seed=args.seed)
+    start = time.perf_counter()
+    total_reward = 0
+    for step_actions in actions:
+        _, rewards, _ = env.step(step_actions)
+        total_reward += int(rewards.sum())
+    batched = time.perf_counter() - start
+
+    worlds = [World(seed=args.seed + i) for i in range(args.envs)]
+    start = time.perf_counter()
+    for step_actions in actions:
+        for world, action in zip(worlds, step_actions.tolist()):
+            world.step([(world_actions[action], None)] if action != NOOP else ())
+            world.events.clear()
+            if world.game_over:
+                world.reset()
+    separate = time.perf_counter() - start
+
+    steps = args.envs * args.steps
+    print(f"batched   {batched * 1e6 / steps:8.2f} us per game step  ({total_reward} points)")
+    print(f"separate  {separate * 1e6 / steps:8.2f} us per game step")
+    print(f"speedup   {separate / batched:8.1f}x")
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())